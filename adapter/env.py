@@ -1,7 +1,9 @@
+import asyncio
 from dataclasses import dataclass
 
 from agents import RunContextWrapper, function_tool
 from agents.tool import FunctionTool
+from pydantic import BaseModel
 from swerex.deployment.abstract import AbstractDeployment
 from swerex.runtime.abstract import (
     BashAction,
@@ -11,7 +13,13 @@ from swerex.runtime.abstract import (
     WriteFileRequest,
 )
 
-from adapter.problem import VerifiableProblem
+from adapter.models.problems import VerifiableProblem
+
+# Cap concurrent tool executions across all agents in the process.
+# parallel_tool_calls=True lets the model fan out unbounded tool calls;
+# without a ceiling they can saturate the event loop and starve each other.
+TOOL_CALL_CONCURRENCY = 8
+_tool_call_semaphore = asyncio.Semaphore(TOOL_CALL_CONCURRENCY)
 
 
 @dataclass
@@ -29,16 +37,26 @@ class ProgrammingEnvironment[T: AbstractDeployment]:
         """Verifies the provided problem by running the test code against the canonical solution."""
         runtime = self.deployment.runtime
 
-        # Prepare the test code
-        await runtime.write_file(
-            WriteFileRequest(path="test.py", content=problem.test_code)
-        )
-
-        # Execute the test script
-        await runtime.write_file(
-            WriteFileRequest(path="test.py", content=problem.test_code)
-        )
-        result = await runtime.run_in_session(BashAction(command="python test.py"))
+        # Inline small test files via a heredoc so write + run is a single
+        # round-trip to the runtime. Large files (or ones containing the
+        # sentinel) fall back to an explicit write_file.
+        sentinel = "__PY_EOF__"
+        if len(problem.test_code) <= 64 * 1024 and sentinel not in problem.test_code:
+            result = await runtime.run_in_session(
+                BashAction(
+                    command=(
+                        f"cat > test.py <<'{sentinel}'\n"
+                        f"{problem.test_code}\n"
+                        f"{sentinel}\n"
+                        "python test.py"
+                    )
+                )
+            )
+        else:
+            await runtime.write_file(
+                WriteFileRequest(path="test.py", content=problem.test_code)
+            )
+            result = await runtime.run_in_session(BashAction(command="python test.py"))
         success = result.exit_code == 0
 
         return success
@@ -48,6 +66,7 @@ class ProgrammingEnvironment[T: AbstractDeployment]:
         return [
             read_file,
             write_file,
+            write_files,
             run_command,
             submit,
         ]
@@ -60,9 +79,10 @@ async def read_file(
     """Reads the content of a file at the given path within the programming environment."""
     runtime = wrapper.context.deployment.runtime
 
-    result: ReadFileResponse = await runtime.read_file(
-        request=ReadFileRequest(path=path)
-    )
+    async with _tool_call_semaphore:
+        result: ReadFileResponse = await runtime.read_file(
+            request=ReadFileRequest(path=path)
+        )
     return result.content
 
 
@@ -73,7 +93,36 @@ async def write_file(
     """Writes the given content to a file at the specified path within the programming environment."""
     runtime = wrapper.context.deployment.runtime
 
-    await runtime.write_file(request=WriteFileRequest(path=path, content=content))
+    async with _tool_call_semaphore:
+        await runtime.write_file(request=WriteFileRequest(path=path, content=content))
+
+
+class FileWrite(BaseModel):
+    """One file to write; dicts are out — strict tool schemas reject free-form
+    object keys, so the batch is a list of explicit (path, content) pairs."""
+
+    path: str
+    content: str
+
+
+@function_tool
+async def write_files(
+    wrapper: RunContextWrapper[ProgrammingEnvironment], files: list[FileWrite]
+) -> None:
+    """Writes multiple files in one call, each given as a path plus its content."""
+    runtime = wrapper.context.deployment.runtime
+
+    # Submit all writes concurrently: one batched round-trip to the runtime
+    # instead of a sequential RPC per file
+    async with _tool_call_semaphore:
+        await asyncio.gather(
+            *[
+                runtime.write_file(
+                    request=WriteFileRequest(path=file.path, content=file.content)
+                )
+                for file in files
+            ]
+        )
 
 
 @function_tool
@@ -83,7 +132,8 @@ async def run_command(
     """Runs a command in the programming environment and returns its output."""
     runtime = wrapper.context.deployment.runtime
 
-    result = await runtime.run_in_session(BashAction(command=bash_command))
+    async with _tool_call_semaphore:
+        result = await runtime.run_in_session(BashAction(command=bash_command))
     return result.output
 
 
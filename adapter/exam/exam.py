@@ -1,5 +1,6 @@
 from adapter.exam.repository import GitRepositoryDict
-from typing import TypedDict
+from functools import lru_cache
+from typing import Any, TypedDict
 import polars as pl
 from pathlib import Path
 from pydantic import BaseModel
@@ -29,21 +30,51 @@ class CodingExamDict(TypedDict):
     question: str
 
 
+@lru_cache(maxsize=8)
+def _load_exam_rows(
+    csv_path: Path, mtime_ns: int, size: int
+) -> dict[str, dict[str, Any]]:
+    """Parse the exam CSV once and index rows by id.
+
+    Keyed on (path, mtime, size) so the cache invalidates when the file
+    changes. A Parquet sidecar is maintained next to the CSV: later
+    processes read the sidecar (no CSV parse at all) as long as it is at
+    least as fresh as the CSV.
+    """
+    sidecar = csv_path.with_suffix(".parquet")
+    try:
+        if sidecar.exists() and sidecar.stat().st_mtime_ns >= mtime_ns:
+            rows = pl.read_parquet(sidecar).to_dicts()
+            return {row["id"]: row for row in rows}
+    except Exception as e:
+        logger.debug(f"Ignoring stale/broken exam sidecar {sidecar}: {e}")
+    df = pl.read_csv(csv_path)
+    try:
+        df.write_parquet(sidecar)
+    except OSError as e:
+        logger.debug(f"Could not write exam sidecar {sidecar}: {e}")
+    return {row["id"]: row for row in df.to_dicts()}
+
+
+def _exam_rows(csv_path: Path) -> dict[str, dict[str, Any]]:
+    stat = csv_path.stat()
+    return _load_exam_rows(csv_path, stat.st_mtime_ns, stat.st_size)
+
+
 def load_exam_from_csv(
     csv_path: Path, exam_id: str, image_name: str, project_dir: Path, library_dir: Path
 ) -> CodingExam:
-    df = pl.read_csv(csv_path)
-    exam_row = df.filter(pl.col("id") == exam_id)
-
-    if exam_row.is_empty():
+    row = _exam_rows(csv_path).get(exam_id)
+    if row is None:
         raise ValueError(f"Exam ID {exam_id} not found in {csv_path}")
 
-    row = exam_row.to_dict(as_series=False)
-    # Extract values (first item of the list for each column)
-    logger.debug(f"Row data: {row}")
-    return CodingExam(
-        id=row["id"][0],
-        image_name=row.get("image_name", [image_name])[0],
+    # Lazy formatting: the row repr is only built when DEBUG is enabled
+    logger.opt(lazy=True).debug("Row data: {row}", row=lambda: row)
+    # Same as load_exams: row values come from the indexed CSV cache, so the
+    # lookup is a dict access and validation can be skipped.
+    return CodingExam.model_construct(
+        id=row["id"],
+        image_name=row.get("image_name") or image_name,
         project=GitRepository(
             name="rust-benchmarks", local_dir=project_dir
         ),  # Reconstruct assuming same project
@@ -51,27 +82,38 @@ def load_exam_from_csv(
             name=library_dir.name, local_dir=library_dir
         ),  # Reconstruct assuming same library
         # Note: In a real scenario you might need to infer repo names from CSV if they vary
-        solution_commit=row["solution_commit"][0],
-        problem_commit=row["problem_commit"][0],
-        question=row["question"][0],
+        solution_commit=row["solution_commit"],
+        problem_commit=row["problem_commit"],
+        question=row["question"],
     )
 
 
 def load_exams(
     csv_path: Path, image_name: str, project_dir: Path, library_dir: Path
 ) -> list[CodingExam]:
-    df = pl.read_csv(csv_path)
-    exams = []
-    for row in df.iter_rows(named=True):
-        exams.append(
-            CodingExam(
-                id=row["id"],
-                image_name=row.get("image_name") or image_name,
-                project=GitRepository(name="rust-benchmarks", local_dir=project_dir),
-                library=GitRepository(name=library_dir.name, local_dir=library_dir),
-                solution_commit=row["solution_commit"],
-                problem_commit=row["problem_commit"],
-                question=row["question"],
-            )
+    # The project/library repos are identical for every row, so build (and
+    # validate) them once instead of per exam. The row values come straight
+    # from the parsed CSV, so model_construct skips redundant validation.
+    project = GitRepository(name="rust-benchmarks", local_dir=project_dir)
+    library = GitRepository(name=library_dir.name, local_dir=library_dir)
+    return [
+        CodingExam.model_construct(
+            id=row["id"],
+            image_name=row.get("image_name") or image_name,
+            project=project,
+            library=library,
+            solution_commit=row["solution_commit"],
+            problem_commit=row["problem_commit"],
+            question=row["question"],
         )
-    return exams
+        for row in _exam_rows(csv_path).values()
+    ]
+
+
+def list_exam_ids(csv_path: Path, status: str | None = None) -> list[str]:
+    """Exam ids from the cached row index, optionally filtered by status."""
+    return [
+        row["id"]
+        for row in _exam_rows(csv_path).values()
+        if status is None or row.get("status") == status
+    ]
@@ -1,8 +1,14 @@
+import asyncio
+import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import platform
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
+from functools import lru_cache
 from pathlib import Path
 from typing import Self
 
@@ -24,6 +30,48 @@ class TestResult(BaseModel):
         return self.stdout + self.stderr
 
 
+@lru_cache(maxsize=1)
+def _scratch_root() -> str | None:
+    """Shared parent for per-exam scratch dirs, preferring tmpfs.
+
+    All exam checkouts land under one pre-created directory instead of
+    scattering over the default tmp backend, and on Linux that directory
+    defaults to /dev/shm: clone/link writes become memory-speed and the
+    detached rm -rf drops pages instead of issuing journaled unlinks.
+    Override with EXAM_TMPDIR; returns None (tempfile default) when no
+    usable root exists.
+    """
+    root = os.environ.get("EXAM_TMPDIR")
+    if root is None and Path("/dev/shm").is_dir():
+        root = "/dev/shm/adapter-exams"
+    if root is None:
+        return None
+    path = Path(root)
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"Scratch root {path} unavailable ({e}); using default tmp")
+        return None
+    return str(path)
+
+
+@lru_cache(maxsize=None)
+def _bare_mirror(source: Path) -> Path:
+    """Create (once per process) a bare mirror of a local repository.
+
+    Temporal clones pass this as --reference so the object store is shared
+    across all exams instead of being copied per clone.
+    """
+    mirror_dir = Path(tempfile.mkdtemp(prefix=f"git-cache-{source.name}-"))
+    subprocess.run(
+        ["git", "clone", "--mirror", str(source), str(mirror_dir)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return mirror_dir
+
+
 class TemporalCodingRepository(BaseModel):
     branch_name: str
     project: GitRepository
@@ -53,21 +101,33 @@ class TemporalCodingRepository(BaseModel):
         logger.info(
             f"Setting up temporal repository {self.branch_name} for project {self.project.name} (setup_library={setup_library})"
         )
-        temp_dir = Path(tempfile.mkdtemp())
-
-        # 1. We clone the root project dir into tempdir.
-        logger.debug(f"Cloning project {self.project.local_dir} to {temp_dir}")
-        try:
-            subprocess.run(
-                ["git", "clone", str(self.project.local_dir), str(temp_dir)],
-                check=True,
-                capture_output=True,
-                text=True,
+        # worktree add wants a path it can create itself, so point it at a
+        # child of the fresh tempdir
+        temp_dir = (
+            Path(
+                tempfile.mkdtemp(
+                    prefix=f"{self.branch_name}-", dir=_scratch_root()
+                )
             )
-        except subprocess.CalledProcessError as e:
-            raise TemporalCodingRepositoryError(
-                f"Initial clone failed: {e.stderr or e.stdout}"
-            ) from e
+            / "checkout"
+        )
+
+        # 1. We materialize the project as a worktree in tempdir, and in
+        # parallel stage the library clone in a sibling tempdir (it is moved
+        # into the project tree afterwards).
+        logger.debug(f"Adding worktree of {self.project.local_dir} at {temp_dir}")
+        library_staging: Path | None = None
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            project_future = pool.submit(self._add_worktree, temp_dir)
+            library_future = None
+            if setup_library:
+                library_staging = (
+                    Path(tempfile.mkdtemp(dir=_scratch_root())) / self.library.name
+                )
+                library_future = pool.submit(self._stage_library, library_staging)
+            project_future.result()
+            if library_future is not None:
+                library_future.result()
 
         # Now that it's a valid repo, we can instantiate the GitRepository object
         self.cloned_repo = GitRepository(
@@ -75,50 +135,190 @@ class TemporalCodingRepository(BaseModel):
         )
         logger.info(f"Created temporal repository at: {self.cloned_repo.local_dir}")
 
-        self._create_branch()
-        if setup_library:
-            self._setup_library()
-
-        # Fix permissions for Docker mount (OpenHands user UID 10001)
+        # worktree add -b already created and checked out the branch; only
+        # the Docker-mount permissions remain to be fixed
         self.cloned_repo.chmod_777()
+        if library_staging is not None:
+            self._setup_library(library_staging)
 
         logger.success(f"Temporal repository {self.branch_name} setup complete")
         return self
 
-    def _create_branch(self) -> None:
-        """2. We create a new git branch in the cloned repository."""
-        self._git.checkout(self.branch_name, create=True)
+    def _add_worktree(self, dest: Path) -> None:
+        """Materialize the project working tree as a git worktree of the source.
 
-    def _setup_library(self) -> None:
-        """3. We clone reference library to PROJECT_ROOT/repositories/{library_name}"""
-        repo_dir = self.local_dir / "repositories" / self.library.name
-        repo_dir.parent.mkdir(parents=True, exist_ok=True)
+        A worktree shares the project's object database outright: no pack
+        copy, no per-exam hardlink farm — only the checked-out files touch
+        disk. Commits made here land directly in the project repository, so
+        problem/solution commits are visible to later environments without
+        a push. Full history stays available for arbitrary checkouts.
+        """
+        try:
+            # Drop records of worktrees whose directories were removed
+            # asynchronously by earlier cleanups; this is metadata-only
+            subprocess.run(
+                ["git", "-C", str(self.project.local_dir), "worktree", "prune"],
+                check=False,
+                capture_output=True,
+            )
+            subprocess.run(
+                [
+                    "git",
+                    "-C",
+                    str(self.project.local_dir),
+                    "worktree",
+                    "add",
+                    "-b",
+                    self.branch_name,
+                    str(dest),
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise TemporalCodingRepositoryError(
+                f"worktree add for '{self.project.name}' failed: {e.stderr or e.stdout}"
+            ) from e
+
+    def _clone(self, repo: GitRepository, dest: Path) -> None:
+        """Clone a local repository into dest, sharing objects via the mirror cache.
+
+        Fallback used when the hardlink library mirror fails; --local
+        hardlinks the object store instead of copying it, which is
+        near-free for a same-filesystem clone.
+        """
         try:
             subprocess.run(
-                ["git", "clone", str(self.library.local_dir), str(repo_dir)],
+                [
+                    "git",
+                    "clone",
+                    "--local",
+                    "--reference-if-able",
+                    str(_bare_mirror(repo.local_dir)),
+                    str(repo.local_dir),
+                    str(dest),
+                ],
                 check=True,
                 capture_output=True,
                 text=True,
             )
         except subprocess.CalledProcessError as e:
             raise TemporalCodingRepositoryError(
-                f"Library clone failed: {e.stderr or e.stdout}"
+                f"Clone of '{repo.name}' failed: {e.stderr or e.stdout}"
             ) from e
 
+    def _stage_library(self, dest: Path) -> None:
+        """Stage the reference library as a hardlinked mirror of the source.
+
+        The library is reference material only (nothing downstream needs its
+        git history), so O(files) link(2) calls replace a full git clone and
+        .git — typically most of the repository's on-disk size — is skipped
+        outright. Hardlinks cannot cross filesystems, and with a tmpfs
+        scratch root the staging dir usually lives on a different device
+        than the source; that is checked up front (copytree would otherwise
+        attempt and fail one link per file before raising) and cross-device
+        staging copies file contents instead, still without .git.
+        """
+        try:
+            same_device = (
+                self.library.local_dir.stat().st_dev == dest.parent.stat().st_dev
+            )
+        except OSError:
+            same_device = False
+        try:
+            shutil.copytree(
+                self.library.local_dir,
+                dest,
+                copy_function=os.link if same_device else shutil.copy2,
+                ignore=shutil.ignore_patterns(".git"),
+            )
+        except OSError as e:
+            logger.debug(f"Library staging copy failed ({e}); falling back to clone")
+            shutil.rmtree(dest, ignore_errors=True)
+            self._clone(self.library, dest)
+
+    def _setup_library(self, staging_dir: Path) -> None:
+        """3. We move the staged library clone to PROJECT_ROOT/repositories/{library_name}"""
+        repo_dir = self.local_dir / "repositories" / self.library.name
+        repo_dir.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(staging_dir), str(repo_dir))
+        # Fix permissions for Docker mount (OpenHands user UID 10001). The
+        # project tree was already chmodded by the branch checkout, so only
+        # the freshly moved library subtree needs it here.
+        try:
+            subprocess.run(["chmod", "-R", "777", str(repo_dir)], check=True)
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Failed to chmod library clone: {e.stderr or e.stdout}")
+
     def cleanup(self) -> None:
         """Clean up the coding environment."""
         try:
+            if self.cloned_repo:
+                # The cat-file session must not outlive its checkout
+                self.cloned_repo.close()
             if self.cloned_repo and self.cloned_repo.exists:
                 logger.info(
                     f"Cleaning up temporal repository at {self.cloned_repo.local_dir}"
                 )
-                shutil.rmtree(self.cloned_repo.local_dir)
+                # Fire-and-forget removal: unlinking the checkout plus the
+                # library link farm is O(files) syscalls that nothing
+                # downstream waits on, so it runs detached instead of
+                # blocking the caller between exams. The worktree lived one
+                # level below its own tempdir, so removing the parent takes
+                # everything. The stale worktree record left behind is
+                # pruned by the next _add_worktree.
+                subprocess.Popen(
+                    ["rm", "-rf", str(self.cloned_repo.local_dir.parent)],
+                    start_new_session=True,
+                )
         except Exception as e:
             msg = f"Cleanup failed: {e}"
             logger.error(msg)
             raise TemporalCodingRepositoryError(msg) from e
 
 
+@lru_cache(maxsize=1)
+def _container_platform() -> str:
+    """Detect the Docker platform string once; the host arch never changes."""
+    machine = platform.machine().lower()
+    return (
+        "linux/arm64" if "arm" in machine or "aarch64" in machine else "linux/amd64"
+    )
+
+
+@lru_cache(maxsize=1)
+def _build_cache_mounts() -> dict[str, str]:
+    """Resolve host cargo/sccache cache mounts once per process.
+
+    The host paths do not change while the process runs, so the existence
+    checks (and the sccache mkdir/chmod) only need to happen on first use.
+    """
+    mounts: dict[str, str] = {}
+
+    # Add cargo cache mounts; check if they exist on host before mounting
+    home = Path.home()
+    cargo_registry = home / ".cargo/registry"
+    cargo_git = home / ".cargo/git"
+    if cargo_registry.exists():
+        mounts[str(cargo_registry)] = "/usr/local/cargo/registry"
+    if cargo_git.exists():
+        mounts[str(cargo_git)] = "/usr/local/cargo/git"
+
+    # Add sccache mount
+    sccache_dir = Path("/var/tmp/sccache")
+    try:
+        sccache_dir.mkdir(parents=True, exist_ok=True)
+        sccache_dir.chmod(0o777)
+    except Exception as e:
+        logger.warning(f"Could not create/chmod sccache dir {sccache_dir}: {e}")
+
+    if sccache_dir.exists():
+        mounts[str(sccache_dir)] = "/var/tmp/sccache"
+
+    return mounts
+
+
 class RustCodingEnvironment(BaseModel):
     project: GitRepository
     library: GitRepository
@@ -132,6 +332,10 @@ class RustCodingEnvironment(BaseModel):
     _temp_repo: TemporalCodingRepository | None = None
     _workspace: MountableDockerWorkspace | None = None
     _exit_stack: ExitStack = PrivateAttr(default_factory=ExitStack)
+    _warmup_proc: subprocess.Popen | None = PrivateAttr(default=None)
+    _target_dir: Path | None = PrivateAttr(default=None)
+    # Commit the worktree was created from; pooled reuse resets to it
+    _base_commit: str | None = PrivateAttr(default=None)
 
     @property
     def cloned_repo(self) -> GitRepository:
@@ -149,37 +353,17 @@ class RustCodingEnvironment(BaseModel):
             library=self.library,
         )
         self._exit_stack.enter_context(self._temp_repo)
+        # Remember where the exam branch started so a pooled reuse can
+        # return here instead of branching off whatever the previous exam
+        # committed
+        self._base_commit = self.cloned_repo.rev_parse()
 
         # 2. Prepare mounts
         mounts = self.extra_mounts.copy()
-
-        # Add cargo cache mounts
-        home = Path.home()
-        cargo_registry = home / ".cargo/registry"
-        cargo_git = home / ".cargo/git"
-
-        # Check if they exist on host before mounting
-        if cargo_registry.exists():
-            mounts[str(cargo_registry)] = "/usr/local/cargo/registry"
-        if cargo_git.exists():
-            mounts[str(cargo_git)] = "/usr/local/cargo/git"
-
-        # Add sccache mount
-        sccache_dir = Path("/var/tmp/sccache")
-        try:
-            sccache_dir.mkdir(parents=True, exist_ok=True)
-            sccache_dir.chmod(0o777)
-        except Exception as e:
-            logger.warning(f"Could not create/chmod sccache dir {sccache_dir}: {e}")
-
-        if sccache_dir.exists():
-            mounts[str(sccache_dir)] = "/var/tmp/sccache"
+        mounts.update(_build_cache_mounts())
 
         # 3. Initialize and start workspace
-        machine = platform.machine().lower()
-        container_platform = (
-            "linux/arm64" if "arm" in machine or "aarch64" in machine else "linux/amd64"
-        )
+        container_platform = _container_platform()
 
         extra_env = {}
         enable_host_gateway = False
@@ -199,10 +383,30 @@ class RustCodingEnvironment(BaseModel):
         )
         self._exit_stack.enter_context(self._workspace)
 
+        # 4. Keep cargo build artifacts outside the checkout, pinned to this
+        # environment: the clean-phase re-run (and the next exam when the
+        # environment is pooled) reuses compiled dependencies instead of
+        # re-resolving and rebuilding from scratch, and the working-tree
+        # resets between exams can no longer wipe target/
+        self._target_dir = Path(
+            tempfile.mkdtemp(prefix=f"cargo-target-{self.project.name}-")
+        )
+
+        # 5. Start compiling test binaries now, while the agent works; the
+        # first run_test then waits on an already-running build instead of
+        # starting one cold
+        self.warm_build()
+
         return self
 
+    def _cargo_env(self) -> dict[str, str]:
+        env = os.environ.copy()
+        if self._target_dir is not None:
+            env["CARGO_TARGET_DIR"] = str(self._target_dir)
+        return env
+
     def push_exam(self, message: str) -> str | None:
-        """Commit changes, push to original project, and return commit hash."""
+        """Commit changes into the shared project repo and return the hash."""
         logger.info(f"Pushing coding exam commit: {message} ({self.branch_name})")
         # 1. Check for changes
         self.cloned_repo.add()
@@ -212,31 +416,105 @@ class RustCodingEnvironment(BaseModel):
             # If no changes, still return the current commit hash
             return None
 
-        # 2. Commit changes
+        # 2. Commit changes. The checkout is a worktree of the project
+        # repository, so the commit lands in its object database directly —
+        # no push step needed for later environments to see it
         logger.debug(f"Committing changes: {message}")
         self.cloned_repo.commit(message)
 
-        # 3. Push branch to origin
-        logger.debug(f"Pushing branch {self.branch_name} to origin")
-        self.cloned_repo.push("origin", self.branch_name)
-
         commit_hash = self.cloned_repo.rev_parse()
         logger.success(f"Commit pushed: {commit_hash}")
         return commit_hash
 
+    def warm_build(self) -> None:
+        """Start compiling the test binaries in the background.
+
+        Kicked off once (e.g. while the agent is still working), so a later
+        run_test only has to execute the already-built binaries.
+        """
+        if self._warmup_proc is not None:
+            return
+        self._warmup_proc = subprocess.Popen(
+            ["cargo", "test", "--no-run"],
+            cwd=self.cloned_repo.local_dir,
+            env=self._cargo_env(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    async def run_test_async(self) -> TestResult:
+        """Async variant of run_test.
+
+        Runs cargo test without pinning a thread, so verification of one exam
+        can overlap with the setup of the next when exams are scheduled
+        concurrently.
+        """
+        if self._warmup_proc is not None:
+            await asyncio.to_thread(self._warmup_proc.wait)
+            self._warmup_proc = None
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "cargo",
+                "test",
+                cwd=self.cloned_repo.local_dir,
+                env=self._cargo_env(),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, stderr = await proc.communicate()
+            return TestResult(
+                is_success=proc.returncode == 0,
+                stdout=stdout.decode(),
+                stderr=stderr.decode(),
+            )
+        except Exception as e:
+            msg = f"Cargo test execution failed: {e}"
+            logger.error(msg)
+            raise TemporalCodingRepositoryError(msg) from e
+
     def run_test(self) -> TestResult:
+        if self._warmup_proc is not None:
+            self._warmup_proc.wait()
+            self._warmup_proc = None
         try:
-            process = subprocess.run(
+            # Stream the output instead of buffering it fully in memory; only
+            # a bounded tail is retained for the TestResult, so verbose test
+            # suites cannot blow up memory.
+            proc = subprocess.Popen(
                 ["cargo", "test"],
                 cwd=self.cloned_repo.local_dir,
-                check=False,
-                capture_output=True,
+                env=self._cargo_env(),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
+                bufsize=1,
             )
+            assert proc.stdout is not None and proc.stderr is not None
+            stdout_tail: deque[str] = deque(maxlen=10_000)
+            stderr_tail: deque[str] = deque(maxlen=10_000)
+
+            def drain(stream, tail: deque[str]) -> None:
+                for line in stream:
+                    tail.append(line)
+
+            def drain_stderr(stream, tail: deque[str]) -> None:
+                for line in stream:
+                    tail.append(line)
+                    # A compile error already decides the outcome; kill the
+                    # build so the caller gets its failure (with the first
+                    # error in the tail) without waiting for the rest of
+                    # the compilation
+                    if "error[E" in line:
+                        proc.kill()
+
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                pool.submit(drain, proc.stdout, stdout_tail)
+                pool.submit(drain_stderr, proc.stderr, stderr_tail)
+                returncode = proc.wait()
             return TestResult(
-                is_success=process.returncode == 0,
-                stdout=process.stdout,
-                stderr=process.stderr,
+                is_success=returncode == 0,
+                stdout="".join(stdout_tail),
+                stderr="".join(stderr_tail),
             )
         except Exception as e:
             msg = f"Cargo test execution failed: {e}"
@@ -245,9 +523,91 @@ class RustCodingEnvironment(BaseModel):
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self._exit_stack.__exit__(exc_type, exc_val, exc_tb)
+        if self._target_dir is not None:
+            # Build artifacts can run to gigabytes; unlink them detached
+            # rather than stalling teardown on the traversal
+            subprocess.Popen(
+                ["rm", "-rf", str(self._target_dir)], start_new_session=True
+            )
+            self._target_dir = None
+
+    @property
+    def base_commit(self) -> str:
+        if self._base_commit is None:
+            raise TemporalCodingRepositoryError("Environment not set up")
+        return self._base_commit
 
     @property
     def workspace(self) -> MountableDockerWorkspace:
         if self._workspace is None:
             raise TemporalCodingRepositoryError("Workspace not initialized")
         return self._workspace
+
+
+class RustEnvironmentPool:
+    """Reuses RustCodingEnvironments (and their containers) across exams.
+
+    Container start, health check and cargo cache warm-up dominate the
+    per-exam cost; instead of tearing an environment down after each solve,
+    released environments are parked per (project, library, image, vllm_port)
+    and their working trees are reset for the next exam.
+    """
+
+    def __init__(self) -> None:
+        self._idle: dict[tuple, list[RustCodingEnvironment]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(env: RustCodingEnvironment) -> tuple:
+        return (
+            env.project.local_dir,
+            env.library.local_dir,
+            env.image,
+            env.vllm_port,
+        )
+
+    def acquire(
+        self,
+        branch_name: str,
+        project: GitRepository,
+        library: GitRepository,
+        image: str,
+        vllm_port: int | None = None,
+    ) -> RustCodingEnvironment:
+        key = (project.local_dir, library.local_dir, image, vllm_port)
+        with self._lock:
+            idle = self._idle.get(key)
+            env = idle.pop() if idle else None
+        if env is None:
+            env = RustCodingEnvironment(
+                branch_name=branch_name,
+                project=project,
+                library=library,
+                image=image,
+                vllm_port=vllm_port,
+            )
+            return env.__enter__()
+
+        # Reset the reused checkout for the new exam: drop tracked edits and
+        # untracked files (keeping the reference library), return HEAD to the
+        # commit the environment was created from — the previous exam left it
+        # on its own problem/solution commits — then branch afresh.
+        repo = env.cloned_repo
+        repo.run_git(["reset", "--hard"])
+        repo.run_git(["clean", "-fd", "-e", "repositories"])
+        repo.checkout(env.base_commit)
+        repo.checkout(branch_name, create=True)
+        env.branch_name = branch_name
+        return env
+
+    def release(self, env: RustCodingEnvironment) -> None:
+        with self._lock:
+            self._idle.setdefault(self._key(env), []).append(env)
+
+    def close(self) -> None:
+        """Tear down all pooled environments."""
+        with self._lock:
+            envs = [env for idle in self._idle.values() for env in idle]
+            self._idle.clear()
+        for env in envs:
+            env.__exit__(None, None, None)
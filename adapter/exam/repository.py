@@ -1,15 +1,48 @@
 from typing import TypedDict
 from adapter.exam.exception import TemporalCodingRepositoryError
+import os
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+
+
+@lru_cache(maxsize=1)
+def _git_env() -> dict[str, str]:
+    """Process environment with per-invocation git tuning baked in.
+
+    GIT_CONFIG_* variables act like -c flags without touching any config
+    file: preloadIndex parallelizes the index refresh behind status and
+    checkout on these many-small-files rust trees, and pack.threads=0
+    lets pack operations use every core. Resolved once per process.
+    """
+    env = os.environ.copy()
+    env.update(
+        {
+            "GIT_CONFIG_COUNT": "2",
+            "GIT_CONFIG_KEY_0": "core.preloadIndex",
+            "GIT_CONFIG_VALUE_0": "true",
+            "GIT_CONFIG_KEY_1": "pack.threads",
+            "GIT_CONFIG_VALUE_1": "0",
+        }
+    )
+    return env
+
+# Directories already validated as git repositories; constructing another
+# GitRepository over the same path skips the probe entirely
+_validated_dirs: set[Path] = set()
 
 
 class GitRepository(BaseModel):
     name: str
     local_dir: Path
+    # True once the whole tree has been swept by chmod -R 777; afterwards
+    # only dirty paths need re-chmodding
+    _chmod_done: bool = PrivateAttr(default=False)
+    # Lazy long-running `git cat-file --batch-check` used for ref resolution
+    _cat_file_proc: subprocess.Popen | None = PrivateAttr(default=None)
 
     def model_post_init(self, __context) -> None:
         """Verify the directory exists and is a valid git repository."""
@@ -17,10 +50,21 @@ class GitRepository(BaseModel):
             raise TemporalCodingRepositoryError(
                 f"Repository directory does not exist: {self.local_dir}"
             )
-        # Check if it's a valid git repo
-        self.run_git(["rev-parse", "--is-inside-work-tree"])
+        resolved = self.local_dir.resolve()
+        if resolved in _validated_dirs:
+            return
+        # .git is a directory in a normal checkout and a gitdir file in a
+        # worktree; either proves this is a repository without forking git
+        # the way the old rev-parse probe did on every construction
+        if not (self.local_dir / ".git").exists():
+            raise TemporalCodingRepositoryError(
+                f"Not a git repository: {self.local_dir}"
+            )
+        _validated_dirs.add(resolved)
 
-    def run_git(self, args: list[str], cwd: Path | None = None) -> str:
+    def run_git(
+        self, args: list[str], cwd: Path | None = None, capture_stdout: bool = True
+    ) -> str:
         command = ["git"] + args
         working_dir = cwd or self.local_dir
         logger.debug(f"Running git command: {' '.join(command)} in {working_dir}")
@@ -29,45 +73,149 @@ class GitRepository(BaseModel):
                 command,
                 cwd=working_dir,
                 check=True,
-                capture_output=True,
-                text=True,
+                # Mutating commands never read their stdout; DEVNULL skips
+                # the kernel->userspace copy of checkout/commit chatter.
+                # stderr stays captured for the error path either way, and
+                # output is decoded once as bytes rather than line by line.
+                stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                env=_git_env(),
             )
-            return result.stdout.strip()
+            return result.stdout.decode().strip() if capture_stdout else ""
         except subprocess.CalledProcessError as e:
-            msg = f"Git command failed in repository '{self.name}': {e.stderr or e.stdout}"
+            stderr = e.stderr.decode(errors="replace") if e.stderr else ""
+            stdout = e.stdout.decode(errors="replace") if e.stdout else ""
+            msg = f"Git command failed in repository '{self.name}': {stderr or stdout}"
             logger.error(msg)
             raise TemporalCodingRepositoryError(msg) from e
 
     def checkout(self, branch: str, create: bool = False) -> None:
         args = ["checkout", "-b", branch] if create else ["checkout", branch]
-        self.run_git(args)
+        self.run_git(args, capture_stdout=False)
+        # checkout rewrites tracked files with default permissions, so the
+        # next chmod pass has to sweep the whole tree again
+        self._chmod_done = False
         self.chmod_777()
 
     def add(self, path: str = ".") -> None:
         self.chmod_777()
-        self.run_git(["add", path])
+        self.run_git(["add", path], capture_stdout=False)
 
     def commit(self, message: str) -> None:
-        self.run_git(["commit", "-m", message])
+        self.run_git(["commit", "-m", message], capture_stdout=False)
 
     def push(self, remote: str, branch: str) -> None:
-        self.run_git(["push", remote, branch])
+        self.run_git(["push", remote, branch], capture_stdout=False)
+
+    def _cat_file_session(self) -> subprocess.Popen:
+        """One long-running `git cat-file --batch-check` per repository.
+
+        rev_parse is called after every exam commit; resolving refs through
+        a persistent process replaces a fork+exec per call with a pipe
+        round trip. The session resolves each input name against the
+        current repository state, so commits made after it started are
+        still found.
+        """
+        if self._cat_file_proc is None or self._cat_file_proc.poll() is not None:
+            self._cat_file_proc = subprocess.Popen(
+                ["git", "cat-file", "--batch-check=%(objectname)"],
+                cwd=self.local_dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                bufsize=1,
+                env=_git_env(),
+            )
+        return self._cat_file_proc
 
     def rev_parse(self, ref: str = "HEAD") -> str:
-        return self.run_git(["rev-parse", ref])
+        try:
+            proc = self._cat_file_session()
+            assert proc.stdin is not None and proc.stdout is not None
+            proc.stdin.write(f"{ref}\n")
+            proc.stdin.flush()
+            line = proc.stdout.readline().strip()
+        except OSError:
+            # Broken pipe means the session died mid-call; drop it so the
+            # next rev_parse starts a fresh one
+            self.close()
+            line = ""
+        if not line or line.endswith(("missing", "ambiguous")):
+            # Unresolvable through the batch session (or it died); one
+            # regular rev-parse gives the proper error path
+            return self.run_git(["rev-parse", ref])
+        return line
+
+    def close(self) -> None:
+        """Terminate the persistent cat-file session, if one was started.
+
+        Each session holds a live git process and its pipes; temporal
+        checkouts call this from their cleanup so sessions don't outlive
+        the (rm -rf'd) directories they were opened in and pile up over
+        a run. Safe to call repeatedly; rev_parse starts a new session on
+        demand afterwards.
+        """
+        proc = self._cat_file_proc
+        self._cat_file_proc = None
+        if proc is None:
+            return
+        try:
+            if proc.stdin is not None:
+                proc.stdin.close()  # EOF alone makes git exit
+            if proc.poll() is None:
+                proc.terminate()
+                proc.wait(timeout=5)
+            if proc.stdout is not None:
+                proc.stdout.close()
+        except (OSError, subprocess.TimeoutExpired):
+            proc.kill()
 
     @property
     def exists(self) -> bool:
         return self.local_dir.exists()
 
     def chmod_777(self) -> None:
-        """Apply chmod -R 777 to the repository directory."""
-        logger.debug(f"Applying chmod -R 777 to {self.local_dir}")
+        """Apply chmod -R 777 to the repository directory.
+
+        The recursive sweep is O(files) syscalls, so it runs at most once
+        per tree state: after the first pass only paths git reports as
+        dirty can have been created with default permissions (the sweep
+        leaves directories world-writable), and later calls re-chmod just
+        those instead of walking the whole tree again.
+        """
         try:
-            subprocess.run(["chmod", "-R", "777", str(self.local_dir)], check=True)
+            if not self._chmod_done:
+                logger.debug(f"Applying chmod -R 777 to {self.local_dir}")
+                subprocess.run(["chmod", "-R", "777", str(self.local_dir)], check=True)
+                self._chmod_done = True
+                return
+            dirty = self._dirty_paths()
+            if dirty:
+                logger.debug(f"Applying chmod -R 777 to {len(dirty)} dirty paths")
+                subprocess.run(
+                    ["chmod", "-R", "777", *dirty], cwd=self.local_dir, check=True
+                )
         except subprocess.CalledProcessError as e:
             logger.error(f"Failed to apply chmod -R 777: {e.stderr or e.stdout}")
 
+    def _dirty_paths(self) -> list[str]:
+        """Paths git sees as modified or untracked, relative to local_dir.
+
+        -z terminates entries with NUL and turns off C-style quoting, so
+        paths with spaces or non-ASCII bytes come back verbatim instead of
+        quoted-and-escaped. A rename entry carries a second NUL-separated
+        field holding the original path; only the new path exists on disk.
+        """
+        fields = iter(self.run_git(["status", "--porcelain", "-z"]).split("\0"))
+        paths = []
+        for field in fields:
+            if not field:
+                continue
+            paths.append(field[3:])
+            if field[0] in "RC":
+                next(fields, None)  # skip the rename/copy source path
+        return paths
+
 
 class GitRepositoryDict(TypedDict):
     name: str
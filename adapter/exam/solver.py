@@ -1,3 +1,4 @@
+import asyncio
 from typing import Self
 from dataclasses import dataclass
 from create_coding_exam import ExamConfig
@@ -14,12 +15,32 @@ from openhands.tools.task_tracker import TaskTrackerTool
 from openhands.tools.terminal import TerminalTool
 
 from adapter.exam.exam import CodingExam
-from adapter.exam.renv import RustCodingEnvironment
+from adapter.exam.renv import RustCodingEnvironment, RustEnvironmentPool
+from adapter.exam.workspace import ensure_image
+
+
+# Static template built once at import; per-call work is only the substitution
+_SOLVE_PROMPT_TEMPLATE = """\
+    <task>
+    You are a rust developer tasked with solving a coding exam.
+    Here is the question:
+    {question}
+
+    The project is already set up for you.
+    {lib_info}
+
+    You should:
+    1. Implement the solution in `src/lib.rs`.
+    2. Run the tests in `tests/` to verify your solution (you might need to install `{library_name}` dependency if you need it.
+    3. Once tests pass, you are done.
+    </task>
+    """
 
 
 @dataclass
 class Solver:
     agent: Agent
+    pool: RustEnvironmentPool | None = None
 
     def solve_exam(
         self,
@@ -32,58 +53,89 @@ class Solver:
             f"Starting exam solving (with_library={with_library}) for exam ID: {exam.id}"
         )
 
-        # Set up a temporal repository at the problem_commit
-        # We use the library info stored in the exam
-        with RustCodingEnvironment(
-            branch_name=gen_id(f"solve-{'with-lib' if with_library else 'no-lib'}"),
+        # Pull the image ahead of the environment setup so first-time pulls
+        # don't serialise with container start
+        ensure_image(exam.image_name)
+
+        branch_name = gen_id(f"solve-{'with-lib' if with_library else 'no-lib'}")
+        if self.pool is None:
+            # Set up a temporal repository at the problem_commit
+            # We use the library info stored in the exam
+            with RustCodingEnvironment(
+                branch_name=branch_name,
+                project=exam.project,
+                library=exam.library,
+                image=exam.image_name,
+                vllm_port=vllm_port,
+            ) as env:
+                return self._solve_in_env(exam, env, with_library)
+
+        # With a pool, the container (and its warmed cargo caches) is reused
+        # across exams instead of being recreated per call
+        env = self.pool.acquire(
+            branch_name=branch_name,
             project=exam.project,
             library=exam.library,
             image=exam.image_name,
             vllm_port=vllm_port,
-        ) as env:
-            # Checkout the problem commit
-            logger.info(f"Checking out problem commit: {exam.problem_commit}")
-            env.cloned_repo.checkout(exam.problem_commit)
-
-            workspace = env.workspace
-            empty_response_detector = EmptyResponseDetector()
-
-            # Phase 1: Ask agent to create question, solution, and test
-            conversation = Conversation(
-                agent=self.agent,
-                workspace=workspace,
-                callbacks=[empty_response_detector],
-            )
-            empty_response_detector.set_conversation(conversation)
+        )
+        try:
+            return self._solve_in_env(exam, env, with_library)
+        finally:
+            self.pool.release(env)
 
-            lib_info = (
-                f"The library source code is already available for your reference in `repositories/{exam.library.name}/`."
-                if with_library
-                else f"The library source code is NOT available for your reference. You must solve this using your internal knowledge of `{exam.library.name}`."
-            )
+    def _solve_in_env(
+        self, exam: CodingExam, env: RustCodingEnvironment, with_library: bool
+    ) -> bool:
+        # Checkout the problem commit
+        logger.info(f"Checking out problem commit: {exam.problem_commit}")
+        env.cloned_repo.checkout(exam.problem_commit)
+
+        workspace = env.workspace
+        empty_response_detector = EmptyResponseDetector()
+
+        # Phase 1: Ask agent to create question, solution, and test
+        conversation = Conversation(
+            agent=self.agent,
+            workspace=workspace,
+            callbacks=[empty_response_detector],
+        )
+        empty_response_detector.set_conversation(conversation)
 
-            prompt = f"""\
-    <task>
-    You are a rust developer tasked with solving a coding exam.
-    Here is the question:
-    {exam.question}
+        lib_info = (
+            f"The library source code is already available for your reference in `repositories/{exam.library.name}/`."
+            if with_library
+            else f"The library source code is NOT available for your reference. You must solve this using your internal knowledge of `{exam.library.name}`."
+        )
 
-    The project is already set up for you. 
-    {lib_info}
+        prompt = _SOLVE_PROMPT_TEMPLATE.format(
+            question=exam.question,
+            lib_info=lib_info,
+            library_name=exam.library.name,
+        )
+        conversation.send_message(prompt)
+        conversation.run()
 
-    You should:
-    1. Implement the solution in `src/lib.rs`.
-    2. Run the tests in `tests/` to verify your solution (you might need to install `{exam.library.name}` dependency if you need it.
-    3. Once tests pass, you are done.
-    </task>
-    """
-            conversation.send_message(prompt)
-            conversation.run()
+        # Final verification with cargo test
+        logger.info("Running final verification with cargo test")
+        ret = env.run_test()
+        return ret.is_success
 
-            # Final verification with cargo test
-            logger.info("Running final verification with cargo test")
-            ret = env.run_test()
-            return ret.is_success
+    async def solve_exam_async(
+        self,
+        exam: CodingExam,
+        with_library: bool = True,
+        vllm_port: int | None = None,
+    ) -> bool:
+        """Async wrapper around solve_exam for concurrent scheduling.
+
+        The agent conversation is synchronous, so the whole solve runs in a
+        worker thread; awaiting it lets the event loop overlap the cargo-test
+        phase of one exam with the environment setup of the next.
+        """
+        return await asyncio.to_thread(
+            self.solve_exam, exam, with_library, vllm_port
+        )
 
     @classmethod
     def create(cls, model: str, base_url: str, api_key: str | None = None) -> Self:
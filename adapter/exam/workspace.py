@@ -1,20 +1,75 @@
 from typing import override
 import os
 import threading
+import time
 import uuid
 from typing import Any
 
+import docker
 from openhands.sdk.logger import get_logger
 from openhands.workspace.docker.workspace import (
     DockerWorkspace,
     check_port_available,
-    execute_command,
     find_available_tcp_port,
 )
 from pydantic import Field
 
 logger = get_logger(__name__)
 
+_docker_client: docker.DockerClient | None = None
+_docker_client_lock = threading.Lock()
+
+
+def get_docker_client() -> docker.DockerClient:
+    """Return a process-wide docker SDK client.
+
+    One persistent API client replaces forking a `docker` CLI process per
+    daemon check / container start; the daemon is pinged once at creation.
+    """
+    global _docker_client
+    with _docker_client_lock:
+        if _docker_client is None:
+            try:
+                client = docker.from_env()
+                client.ping()
+            except Exception as e:
+                raise RuntimeError(
+                    "Docker is not available. Please install and start "
+                    "Docker Desktop/daemon."
+                ) from e
+            _docker_client = client
+        return _docker_client
+
+
+# Wall-clock budget for the health event wait, in seconds; on expiry we
+# hand over to the parent's polling implementation rather than blocking
+# forever on a stream that may never deliver a verdict
+_HEALTH_EVENT_TIMEOUT = 180.0
+
+_image_locks: dict[str, threading.Lock] = {}
+_pulled_images: set[str] = set()
+
+
+def ensure_image(image: str) -> None:
+    """Make sure an image is present locally, pulling it at most once.
+
+    Calling this ahead of a batch of container starts removes the implicit
+    first-use pull from the per-exam critical path; the per-image lock keeps
+    concurrent callers from double-pulling.
+    """
+    with _docker_client_lock:
+        lock = _image_locks.setdefault(image, threading.Lock())
+    with lock:
+        if image in _pulled_images:
+            return
+        client = get_docker_client()
+        try:
+            client.images.get(image)
+        except docker.errors.ImageNotFound:
+            logger.info("Pulling image %s", image)
+            client.images.pull(image)
+        _pulled_images.add(image)
+
 
 class MountableDockerWorkspace(DockerWorkspace):
     extra_mounts: dict[str, str] = Field(
@@ -57,26 +112,19 @@ class MountableDockerWorkspace(DockerWorkspace):
                     f"Port {self.host_port + 2} is not available for VNC"
                 )
 
-        # Ensure docker is available
-        docker_ver = execute_command(["docker", "version"]).returncode
-        if docker_ver != 0:
-            raise RuntimeError(
-                "Docker is not available. Please install and start "
-                "Docker Desktop/daemon."
-            )
-
-        # Prepare Docker run flags
-        flags: list[str] = []
-        for key in self.forward_env:
-            if key in os.environ:
-                flags += ["-e", f"{key}={os.environ[key]}"]
+        # Ensure docker is available (pings the daemon once per process)
+        client = get_docker_client()
 
-        for key, value in self.extra_env.items():
-            flags += ["-e", f"{key}={value}"]
+        # Prepare container configuration
+        environment = {
+            key: os.environ[key] for key in self.forward_env if key in os.environ
+        }
+        environment.update(self.extra_env)
 
+        volumes: dict[str, dict[str, str]] = {}
         if self.mount_dir:
             mount_path = "/workspace"
-            flags += ["-v", f"{self.mount_dir}:{mount_path}"]
+            volumes[self.mount_dir] = {"bind": mount_path, "mode": "rw"}
             logger.info(
                 "Mounting host dir %s to container path %s",
                 self.mount_dir,
@@ -84,47 +132,45 @@ class MountableDockerWorkspace(DockerWorkspace):
             )
 
         for host_dir, container_dir in self.extra_mounts.items():
-            flags += ["-v", f"{host_dir}:{container_dir}"]
+            volumes[host_dir] = {"bind": container_dir, "mode": "rw"}
 
-        if self.enable_host_gateway:
-            flags += ["--add-host", "host.docker.internal:host-gateway"]
+        extra_hosts = (
+            {"host.docker.internal": "host-gateway"}
+            if self.enable_host_gateway
+            else None
+        )
 
-        ports = ["-p", f"{self.host_port}:8000"]
+        ports: dict[str, int] = {"8000/tcp": self.host_port}
         if self.extra_ports:
-            ports += [
-                "-p",
-                f"{self.host_port + 1}:8001",  # VSCode
-                "-p",
-                f"{self.host_port + 2}:8002",  # Desktop VNC
-            ]
-        flags += ports
+            ports["8001/tcp"] = self.host_port + 1  # VSCode
+            ports["8002/tcp"] = self.host_port + 2  # Desktop VNC
 
         # Add GPU support if enabled
-        if self.enable_gpu:
-            flags += ["--gpus", "all"]
+        device_requests = (
+            [docker.types.DeviceRequest(count=-1, capabilities=[["gpu"]])]
+            if self.enable_gpu
+            else None
+        )
 
         # Run container
-        run_cmd = [
-            "docker",
-            "run",
-            "-d",
-            "--platform",
-            self.platform,
-            "--rm",
-            "--name",
-            f"agent-server-{uuid.uuid4()}",
-            *flags,
-            image,
-            "--host",
-            "0.0.0.0",
-            "--port",
-            "8000",
-        ]
-        proc = execute_command(run_cmd)
-        if proc.returncode != 0:
-            raise RuntimeError(f"Failed to run docker container: {proc.stderr}")
-
-        self._container_id = proc.stdout.strip()
+        try:
+            container = client.containers.run(
+                image,
+                command=["--host", "0.0.0.0", "--port", "8000"],
+                detach=True,
+                remove=True,
+                platform=self.platform,
+                name=f"agent-server-{uuid.uuid4()}",
+                environment=environment,
+                volumes=volumes,
+                extra_hosts=extra_hosts,
+                ports=ports,
+                device_requests=device_requests,
+            )
+        except docker.errors.DockerException as e:
+            raise RuntimeError(f"Failed to run docker container: {e}") from e
+
+        self._container_id = container.id
         logger.info("Started container: %s", self._container_id)
 
         # Optionally stream logs in background
@@ -143,3 +189,58 @@ class MountableDockerWorkspace(DockerWorkspace):
         # Wait for container to be healthy
         self._wait_for_health()
         logger.info("Docker workspace is ready at %s", self.host)
+
+    @override
+    def _wait_for_health(self) -> None:
+        """Wait on docker health events instead of fixed-cadence polling.
+
+        Subscribing to the health_status event stream makes startup latency
+        "time to actually healthy" rather than "healthy + poll period". The
+        subscription is bounded: the stream also carries die events (an
+        OOM-killed or crashing container never reports a health status), and
+        `until` closes it after _HEALTH_EVENT_TIMEOUT so a silent daemon
+        cannot block startup forever. If the image defines no HEALTHCHECK,
+        the stream errors out, or the deadline passes without a verdict, we
+        fall back to the parent's polling implementation.
+        """
+        try:
+            client = get_docker_client()
+            container = client.containers.get(self._container_id)
+            health = (container.attrs.get("State") or {}).get("Health")
+            if health is None:
+                # No HEALTHCHECK defined: events will never fire
+                super()._wait_for_health()
+                return
+            if health.get("Status") == "healthy":
+                return
+            now = time.time()
+            for event in client.events(
+                decode=True,
+                since=int(now),
+                until=int(now + _HEALTH_EVENT_TIMEOUT),
+                filters={
+                    "container": self._container_id,
+                    "event": ["health_status", "die"],
+                },
+            ):
+                action = event.get("Action", "")
+                if action == "health_status: healthy":
+                    return
+                if action == "die":
+                    # The container is started with remove=True, so after a
+                    # die event there is nothing left to poll
+                    raise RuntimeError(
+                        f"Container {self._container_id} died before becoming "
+                        "healthy"
+                    )
+            logger.warning(
+                "No health verdict within %.0fs; falling back to polling",
+                _HEALTH_EVENT_TIMEOUT,
+            )
+        except RuntimeError:
+            raise
+        except Exception as e:
+            logger.debug(
+                "Health event stream unavailable (%s); falling back to polling", e
+            )
+        super()._wait_for_health()
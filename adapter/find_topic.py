@@ -1,24 +1,23 @@
 from oai_utils.agent import AgentsSDKModel
 from oai_utils.client import get_aoai
-from adapter.topic.topics import Topics
+from adapter.topic.topics import Topic, Topics
+from pydantic import BaseModel
 from oai_utils.mcp.filesystem import filesystem_mcp
+from adapter.mcp.cache import CachingMCPServer
+from adapter.utils.disk_cache import cache_get, cache_key, cache_put, model_key
+from contextlib import AsyncExitStack
 from pathlib import Path
 from textwrap import dedent
 
+from agents.mcp.server import MCPServerStdio
 from agents.model_settings import ModelSettings
+from async_utils import gather_with_semaphore
 from oai_utils.agent import AgentWrapper
 
 
-async def find_topics(
-    local_path: Path, file_path: str, model: AgentsSDKModel | None = None
-) -> Topics:
-    if model is None:
-        model = get_aoai("gpt-5-mini")
-    async with filesystem_mcp([str(local_path)]) as filesystem:
-        agent = AgentWrapper[Topics].create(
-            name="topic_finder",
-            instructions=dedent(
-                """\
+# Dedent the static instructions once at import instead of per call
+_INSTRUCTIONS = dedent(
+    """\
 You are a curriculum designer.
 Given a local path of cloned repository and a specific file path inside the repository, your task is to create a curriculum for learners for the library based on the content of the provided file path.
 You have access to a filesystem MCP server that allows you to query repository contents.
@@ -39,16 +38,169 @@ Your response should be structured as following:
 
 Based on your list, another agent will dive deeper for each topic and create exercises.
 """,
-            ),
+)
+
+
+async def find_topics(
+    local_path: Path,
+    file_path: str,
+    model: AgentsSDKModel | None = None,
+    filesystem: MCPServerStdio | None = None,
+) -> Topics:
+    if model is None:
+        model = get_aoai("gpt-5-mini")
+    # Build the input before entering the MCP context so the session is
+    # only open for the agent run itself
+    input_text = f"GitHub URL: {local_path}\nFilePath: {file_path}"
+    # Documentation files rarely change between runs over the same checkout,
+    # so a disk hit skips both the MCP session and the LLM call
+    key = cache_key("topic_finder", model_key(model), _INSTRUCTIONS, input_text)
+    cached = cache_get(key)
+    if cached is not None:
+        return Topics.model_validate_json(cached)
+    async with AsyncExitStack() as stack:
+        # Reuse a caller-provided MCP session when batching; opening one per
+        # call costs a subprocess spawn plus an MCP handshake each time
+        if filesystem is None:
+            filesystem = CachingMCPServer(
+                await stack.enter_async_context(filesystem_mcp([str(local_path)]))
+            )
+        agent = AgentWrapper[Topics].create(
+            name="topic_finder",
+            instructions=_INSTRUCTIONS,
             mcp_servers=[
                 filesystem,
             ],
             model=model,
             output_type=Topics,
-            model_settings=ModelSettings(parallel_tool_calls=True),
+            # Single MCP server with batch_execute fan-out; parallel tool
+            # routing adds prompt overhead without extra concurrency
+            model_settings=ModelSettings(parallel_tool_calls=False),
         )
         result = await agent.run(
-            input=f"GitHub URL: {local_path}\nFilePath: {file_path}",
+            input=input_text,
             max_turns=20,
         )
-        return result.final_output()
+        topics = result.final_output()
+        cache_put(key, topics.model_dump_json())
+        return topics
+
+
+class FileTopics(BaseModel):
+    file_path: str
+    topics: list[Topic]
+
+
+class FileTopicsList(BaseModel):
+    files: list[FileTopics]
+
+
+# Covering several files per call amortizes the fixed per-call latency and
+# keeps the shared instruction prefix warm in the provider's prompt cache
+_BATCH_INSTRUCTIONS = dedent(
+    """\
+You are a curriculum designer.
+Given a local path of cloned repository and several file paths inside the repository, your task is to create a curriculum for learners for the library based on the content of those files.
+You have access to a filesystem MCP server that allows you to query repository contents. Read all the listed files in a single `batch_execute` call rather than one by one.
+For each file, respond with an exhaustive list of concepts or topics in the document to learn for the new library user.
+
+Each topic will be used for creating exercises by another process.
+Some documents include information not useful for library learners such as contribution guides. Return an empty topic list for such files.
+
+Your response should be structured as following:
+```json
+{
+    "files": [
+        {
+            "file_path": "the file path exactly as given",
+            "topics": [
+                {
+                    "title": "Topic title",
+                    "description": "Detailed description of what the user is expected to learn"
+                }
+            ]
+        }
+    ]
+}
+```
+
+Include one entry per input file, in any order, keyed by the exact file path. Based on your list, another agent will dive deeper for each topic and create exercises.
+""",
+)
+
+
+async def find_topics_for_files(
+    local_path: Path,
+    file_paths: list[str],
+    model: AgentsSDKModel | None = None,
+    filesystem: MCPServerStdio | None = None,
+) -> list[Topics]:
+    """Extract topics for a chunk of files with a single agent call.
+
+    Returns one Topics per input path, in input order; files the model
+    fails to cover come back empty rather than failing the chunk.
+    """
+    if model is None:
+        model = get_aoai("gpt-5-mini")
+    input_text = "GitHub URL: {}\nFilePaths:\n{}".format(
+        local_path, "\n".join(f"- {file_path}" for file_path in file_paths)
+    )
+    key = cache_key("topic_finder_batch", model_key(model), _BATCH_INSTRUCTIONS, input_text)
+    cached = cache_get(key)
+    if cached is not None:
+        output = FileTopicsList.model_validate_json(cached)
+    else:
+        async with AsyncExitStack() as stack:
+            if filesystem is None:
+                filesystem = CachingMCPServer(
+                    await stack.enter_async_context(filesystem_mcp([str(local_path)]))
+                )
+            agent = AgentWrapper[FileTopicsList].create(
+                name="topic_finder_batch",
+                instructions=_BATCH_INSTRUCTIONS,
+                mcp_servers=[
+                    filesystem,
+                ],
+                model=model,
+                output_type=FileTopicsList,
+                model_settings=ModelSettings(parallel_tool_calls=False),
+            )
+            result = await agent.run(
+                input=input_text,
+                max_turns=20,
+            )
+            output = result.final_output()
+            cache_put(key, output.model_dump_json())
+    by_path = {entry.file_path: entry.topics for entry in output.files}
+    return [Topics(topics=by_path.get(file_path, [])) for file_path in file_paths]
+
+
+async def find_topics_batch(
+    local_path: Path,
+    file_paths: list[str],
+    model: AgentsSDKModel | None = None,
+    max_concurrency: int = 16,
+    batch_size: int = 8,
+) -> list[Topics]:
+    """Run topic extraction over many files, preserving input order.
+
+    Files are grouped batch_size per agent call, and a single filesystem
+    MCP session is shared across the whole batch instead of one per chunk.
+    """
+    chunks = [
+        file_paths[i : i + batch_size] for i in range(0, len(file_paths), batch_size)
+    ]
+    async with filesystem_mcp([str(local_path)]) as session:
+        # One shared read cache across the batch: every file is fetched
+        # through the MCP at most once per (mtime, size)
+        filesystem = CachingMCPServer(session)
+        per_chunk = await gather_with_semaphore(
+            [
+                find_topics_for_files(
+                    local_path, chunk, model=model, filesystem=filesystem
+                )
+                for chunk in chunks
+            ],
+            max_concurrency,
+        )
+    return [topics for chunk_topics in per_chunk for topics in chunk_topics]
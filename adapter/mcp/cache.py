@@ -0,0 +1,149 @@
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from agents.mcp.server import MCPServerStdio
+from mcp.types import CallToolResult, TextContent, Tool
+
+# Filesystem MCP tool names that read file content and are safe to memoize
+_READ_TOOLS = {"read_file", "read_text_file", "read_multiple_files"}
+# Tool names that mutate the filesystem and must drop the cache
+_WRITE_TOOLS = {"write_file", "edit_file", "create_directory", "move_file"}
+
+# Synthetic aggregator tool: one MCP round-trip fans out several independent
+# sub-operations instead of paying a stdio round-trip per call
+_BATCH_TOOL = Tool(
+    name="batch_execute",
+    description=(
+        "Execute several filesystem tool calls in parallel and return their "
+        "results in order. Prefer this over sequential calls when reading "
+        "more than one file."
+    ),
+    inputSchema={
+        "type": "object",
+        "properties": {
+            "ops": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "args": {"type": "object"},
+                    },
+                    "required": ["name"],
+                },
+            },
+        },
+        "required": ["ops"],
+    },
+)
+
+
+class CachingMCPServer:
+    """Content-addressed read cache in front of a filesystem MCP server.
+
+    Within one topic, QA generation and every per-QA hindsight reasoning call
+    re-read the same documentation file through the MCP, paying a stdio
+    round-trip for identical bytes each time. Read results are keyed on
+    (tool, path, mtime_ns, size), so repeat reads are served locally while a
+    changed file naturally misses. Any write-class tool call clears the cache.
+
+    All other attributes delegate to the wrapped server, so the instance can
+    be passed anywhere an ``MCPServerStdio`` session is expected.
+    """
+
+    def __init__(
+        self,
+        server: MCPServerStdio,
+        maxsize: int = 256,
+        concurrency: int | None = None,
+    ) -> None:
+        self._server = server
+        self._maxsize = maxsize
+        self._cache: OrderedDict[tuple[str, str, int, int], Any] = OrderedDict()
+        # Optional bound on in-flight tool calls into the stdio child; used
+        # when the session is shared across many concurrent topics
+        self._semaphore = asyncio.Semaphore(concurrency) if concurrency else None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._server, name)
+
+    async def __aenter__(self) -> "CachingMCPServer":
+        await self._server.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self._server.__aexit__(*exc_info)
+
+    @staticmethod
+    def _stat_key(path: str) -> tuple[int, int] | None:
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    async def _call(
+        self, tool_name: str, arguments: dict[str, Any] | None
+    ) -> Any:
+        if self._semaphore is None:
+            return await self._server.call_tool(tool_name, arguments)
+        async with self._semaphore:
+            return await self._server.call_tool(tool_name, arguments)
+
+    async def list_tools(self, *args: Any, **kwargs: Any) -> Any:
+        tools = await self._server.list_tools(*args, **kwargs)
+        return [*tools, _BATCH_TOOL]
+
+    async def _batch_execute(
+        self, arguments: dict[str, Any] | None
+    ) -> CallToolResult:
+        ops = (arguments or {}).get("ops") or []
+        results = await asyncio.gather(
+            *(self.call_tool(op["name"], op.get("args")) for op in ops),
+            return_exceptions=True,
+        )
+        content: list[Any] = []
+        is_error = False
+        for op, result in zip(ops, results):
+            if isinstance(result, BaseException):
+                content.append(
+                    TextContent(type="text", text=f"{op['name']} failed: {result}")
+                )
+                is_error = True
+            else:
+                content.extend(result.content)
+                is_error = is_error or bool(getattr(result, "isError", False))
+        return CallToolResult(content=content, isError=is_error)
+
+    async def call_tool(
+        self, tool_name: str, arguments: dict[str, Any] | None
+    ) -> Any:
+        if tool_name == "batch_execute":
+            return await self._batch_execute(arguments)
+        if tool_name in _WRITE_TOOLS:
+            self._cache.clear()
+            return await self._call(tool_name, arguments)
+        if (
+            tool_name not in _READ_TOOLS
+            or not arguments
+            or not isinstance(arguments.get("path"), str)
+        ):
+            return await self._call(tool_name, arguments)
+
+        stat_key = self._stat_key(arguments["path"])
+        if stat_key is None:
+            return await self._call(tool_name, arguments)
+        key = (tool_name, arguments["path"], *stat_key)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+
+        result = await self._call(tool_name, arguments)
+        if not getattr(result, "isError", False):
+            self._cache[key] = result
+            if len(self._cache) > self._maxsize:
+                self._cache.popitem(last=False)
+        return result
@@ -0,0 +1,44 @@
+import asyncio
+from pathlib import Path
+
+from oai_utils.mcp.filesystem import filesystem_mcp
+
+from adapter.mcp.cache import CachingMCPServer
+
+# Bound on concurrent tool calls into one shared stdio child, so a batch of
+# topics cannot overload the subprocess behind the session
+MCP_TOOL_CONCURRENCY = 16
+
+_lock = asyncio.Lock()
+_servers: dict[tuple[str, ...], CachingMCPServer] = {}
+
+
+async def get_filesystem_mcp(
+    allowed_directories: list[Path | str],
+) -> CachingMCPServer:
+    """Return a started, process-wide filesystem MCP session for the roots.
+
+    The stdio subprocess spawn and MCP handshake are paid once per set of
+    allowed directories instead of once per caller; the session is wrapped in
+    the read cache and a tool-call semaphore. Call close_filesystem_mcps()
+    at shutdown.
+    """
+    key = tuple(sorted(str(d) for d in allowed_directories))
+    async with _lock:
+        server = _servers.get(key)
+        if server is None:
+            server = CachingMCPServer(
+                filesystem_mcp([str(d) for d in allowed_directories]),
+                concurrency=MCP_TOOL_CONCURRENCY,
+            )
+            await server.__aenter__()
+            _servers[key] = server
+        return server
+
+
+async def close_filesystem_mcps() -> None:
+    """Stop every pooled MCP session and forget it."""
+    async with _lock:
+        for server in _servers.values():
+            await server.__aexit__(None, None, None)
+        _servers.clear()
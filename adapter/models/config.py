@@ -12,6 +12,10 @@ class ProblemCreationConfig:
     batch_size: int
     output_dir: Path
     model: AgentsSDKModel
+    # Estimated tokens-per-minute budget for question generation; providers
+    # meter by tokens, so the fan-out is paced by this rather than only by
+    # the request-count semaphore
+    tpm_budget: int = 200_000
 
     @property
     def repo_name(self) -> str:
@@ -1,9 +1,35 @@
 from adapter.solver.constant import SOLVER_PROMPT
+import heapq
+from pathlib import Path
 from textwrap import dedent
 from typing import Self
 from adapter.utils.savable import Savable
 from datasets import Dataset
-import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+_ARROW_SUFFIXES = {".parquet", ".arrow", ".feather"}
+
+
+# Dedent the skeleton once at import; dedenting the formatted result would
+# rescan the embedded problem/solution/test bodies on every call
+_PROBLEM_MD_TEMPLATE = dedent(
+    """\
+    ## {task_name}
+    ### Problem Statement
+    {problem_statement}
+    ### Canonical Solution
+    ```python
+    {canonical_solution}
+    ```
+    ### Test Code
+    ```python
+    {test_code}
+    ```
+    """
+)
 
 
 class VerifiableProblem(Savable):
@@ -13,20 +39,11 @@ class VerifiableProblem(Savable):
     test_code: str
 
     def as_md(self) -> str:
-        return dedent(
-            f"""\
-        ## {self.task_name}
-        ### Problem Statement
-        {self.problem_statement}
-        ### Canonical Solution
-        ```python
-        {self.canonical_solution}
-        ```
-        ### Test Code
-        ```python
-        {self.test_code}
-        ```
-        """
+        return _PROBLEM_MD_TEMPLATE.format(
+            task_name=self.task_name,
+            problem_statement=self.problem_statement,
+            canonical_solution=self.canonical_solution,
+            test_code=self.test_code,
         )
 
 
@@ -48,16 +65,112 @@ class QRA(Savable):
 class QRADataset(Savable):
     problems: list[QRA]
 
+    def save(self, path: Path) -> None:
+        """Save as Arrow/Parquet when the suffix asks for it, else JSON.
+
+        The columnar path writes the three string columns directly instead
+        of re-serializing multi-MB reasoning traces through Pydantic JSON.
+        """
+        if path.suffix not in _ARROW_SUFFIXES:
+            super().save(path)
+            return
+        table = pa.table(
+            {
+                "question": pa.array(
+                    [s.question for s in self.problems], type=pa.large_string()
+                ),
+                "answer": pa.array(
+                    [s.answer for s in self.problems], type=pa.large_string()
+                ),
+                "reasoning": pa.array(
+                    [s.reasoning for s in self.problems], type=pa.large_string()
+                ),
+            }
+        )
+        if path.suffix == ".parquet":
+            pq.write_table(table, path, compression="zstd")
+        else:
+            feather.write_feather(table, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        if path.suffix not in _ARROW_SUFFIXES:
+            return super().load(path)
+        if path.suffix == ".parquet":
+            table = pq.read_table(path)
+        else:
+            table = feather.read_table(path)
+        return cls.model_construct(
+            problems=[
+                QRA.model_construct(question=q, answer=a, reasoning=r)
+                for q, a, r in zip(
+                    table.column("question").to_pylist(),
+                    table.column("answer").to_pylist(),
+                    table.column("reasoning").to_pylist(),
+                )
+            ]
+        )
+
     def as_prompt_completion(self) -> Dataset:
-        prompt = []
-        completion = []
-        for sample in self.problems:
-            prompt.append(sample.question)
-            completion.append(
-                f"<think>\n{sample.reasoning}\n</think>\n\n{sample.answer}"
-            )
-        dataframe = pl.DataFrame({"prompt": prompt, "completion": completion})
-        return Dataset.from_polars(dataframe)
+        # Build Arrow arrays directly; Dataset is Arrow-backed, so going
+        # through a Polars DataFrame was one full extra copy of the strings.
+        prompt = [sample.question for sample in self.problems]
+        reasoning = pa.array(
+            [sample.reasoning for sample in self.problems], type=pa.large_string()
+        )
+        answer = pa.array(
+            [sample.answer for sample in self.problems], type=pa.large_string()
+        )
+        # One Arrow kernel call concatenates the whole column in C++ instead
+        # of a Python-level loop over multi-KB strings.
+        completion = pc.binary_join_element_wise(
+            pa.scalar("<think>\n", type=pa.large_string()),
+            reasoning,
+            pa.scalar("\n</think>\n\n", type=pa.large_string()),
+            answer,
+            "",
+        )
+        table = pa.table(
+            {
+                "prompt": pa.array(prompt, type=pa.large_string()),
+                "completion": completion,
+            }
+        )
+        return Dataset(table)
+
+    def write_prompt_completion_parquet(
+        self, path: Path, row_group_size: int = 8192
+    ) -> None:
+        """Stream the prompt/completion pairs straight to a Parquet file.
+
+        Writes one row group at a time, so only a single buffer is live
+        instead of the full Dataset plus its source lists; useful when the
+        result is only saved to disk anyway.
+        """
+        schema = pa.schema(
+            [("prompt", pa.large_string()), ("completion", pa.large_string())]
+        )
+        with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+            for start in range(0, len(self.problems), row_group_size):
+                chunk = self.problems[start : start + row_group_size]
+                batch = pa.record_batch(
+                    [
+                        pa.array(
+                            [s.question for s in chunk], type=pa.large_string()
+                        ),
+                        pa.array(
+                            [
+                                "".join(
+                                    ("<think>\n", s.reasoning, "\n</think>\n\n", s.answer)
+                                )
+                                for s in chunk
+                            ],
+                            type=pa.large_string(),
+                        ),
+                    ],
+                    schema=schema,
+                )
+                writer.write_batch(batch)
 
     def as_conversational(self, system_prompt: str = SOLVER_PROMPT) -> Dataset:
         items = [
@@ -86,3 +199,14 @@ class QRADataset(Savable):
 
     def head(self, n: int) -> Self:
         return self.__class__(problems=self.problems[:n])
+
+    def top_k(self, k: int) -> Self:
+        """Equivalent to sort().head(k) without sorting the whole dataset.
+
+        heapq keeps a k-item heap over a single pass, so picking a small
+        evaluation slice out of a large dataset is O(N log k) and never
+        materializes the fully sorted copy.
+        """
+        return self.__class__(
+            problems=heapq.nsmallest(k, self.problems, key=lambda x: x.question)
+        )
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from oai_utils.agent import AgentWrapper, AgentsSDKModel
 from adapter.models.problems import QAProblem
+from adapter.utils.agent_cache import cached_agent
 
 
 class QAEvalResult(BaseModel):
@@ -8,12 +9,24 @@ class QAEvalResult(BaseModel):
     is_correct: bool
 
 
+class IndexedQAEvalResult(QAEvalResult):
+    idx: int
+
+
+class QAEvalBatch(BaseModel):
+    results: list[IndexedQAEvalResult]
+
+
 async def evaluate_qa(
     problem: QAProblem, answer: str, model: AgentsSDKModel = "gpt-5-mini"
 ) -> QAEvalResult:
-    agent = AgentWrapper[QAEvalResult].create(
-        name="qa_evaluator",
-        instructions="""\
+    # MCP-free agent: reuse one instance per model across evaluations
+    agent = cached_agent(
+        "qa_evaluator",
+        model,
+        lambda: AgentWrapper[QAEvalResult].create(
+            name="qa_evaluator",
+            instructions="""\
 You are a Senior Technical Auditor and Software Engineer specialized in library-level system design and developer operations. 
 Your task is to perform a rigorous comparative analysis between a "Ground Truth Answer" (GT) and a "Candidate's Answer" based on a provided "Question."
 
@@ -29,8 +42,9 @@ You MUST respond with a valid JSON object that conforms to the following Pydanti
     "reason": "Explanation of why the answer is or is not correct."
     "is_correct": "boolean. True if the answer is semantically same with the ground truth, False otherwise.",
 }""",
-        model=model,
-        output_type=QAEvalResult,
+            model=model,
+            output_type=QAEvalResult,
+        ),
     )
 
     input_text = f"""\
@@ -40,3 +54,66 @@ Candidate's Answer: {answer}
 """
     ret = await agent.run(input=input_text)
     return ret.final_output()
+
+
+async def evaluate_qa_batch(
+    problems: list[QAProblem],
+    answers: list[str],
+    model: AgentsSDKModel = "gpt-5-mini",
+) -> list[QAEvalResult]:
+    """Judge several answers in a single LLM call.
+
+    One request per answer means one network round trip and one copy of the
+    judging instructions per answer; grading a handful of Q/A pairs at a
+    time amortizes both. Results are matched back by index, and a pair the
+    judge dropped from its output is scored incorrect rather than guessed.
+    """
+    agent = cached_agent(
+        "qa_evaluator_batch",
+        model,
+        lambda: AgentWrapper[QAEvalBatch].create(
+            name="qa_evaluator_batch",
+            instructions="""\
+You are a Senior Technical Auditor and Software Engineer specialized in library-level system design and developer operations.
+You will receive several independent evaluation items. For EACH item, perform a rigorous comparative analysis between its "Ground Truth Answer" (GT) and its "Candidate's Answer" based on its "Question."
+
+### Evaluation Criteria (apply to every item separately):
+1. **Identity & Context Accuracy**: Does the Candidate's Answer identify the specific, correct targets, classes, or configuration flags used by the library?
+2. **Logic & Mechanics**: Does the Candidate correctly explain 'how' the system works (e.g., variable precedence, build tools like maturin, or internal method composition)?
+3. **Gap Analysis**: What specific technical nuances or "secret sauce" found in the GT are missing from the Candidate's Answer?
+4. **Actionability**: Are the commands/codes provided by the Candidate literally correct, or are they generic "best guesses"?
+
+### OUTPUT FORMAT:
+You MUST respond with a valid JSON object that conforms to the following Pydantic-ready structure, with exactly one entry per item, echoing each item's idx:
+{
+    "results": [
+        {
+            "idx": "integer. The idx of the item this verdict is for.",
+            "reason": "Explanation of why the answer is or is not correct.",
+            "is_correct": "boolean. True if the answer is semantically same with the ground truth, False otherwise.",
+        }
+    ]
+}""",
+            model=model,
+            output_type=QAEvalBatch,
+        ),
+    )
+
+    input_text = "\n".join(
+        f"""\
+<item idx="{idx}">
+Question: {problem.question}
+Ground Truth Answer: {problem.answer}
+Candidate's Answer: {answer}
+</item>"""
+        for idx, (problem, answer) in enumerate(zip(problems, answers))
+    )
+    ret = await agent.run(input=input_text)
+    by_idx = {result.idx: result for result in ret.final_output().results}
+    return [
+        by_idx.get(
+            idx,
+            QAEvalResult(reason="Missing from judge output", is_correct=False),
+        )
+        for idx in range(len(problems))
+    ]
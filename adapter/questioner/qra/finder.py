@@ -1,12 +1,16 @@
 from oai_utils.agent import AgentsSDKModel
 from oai_utils.client import get_aoai
+from contextlib import AsyncExitStack
 from pathlib import Path
 from textwrap import dedent
 
+from agents.mcp.server import MCPServerStdio
 from agents.model_settings import ModelSettings
 from oai_utils.agent import AgentWrapper
 from oai_utils.mcp.filesystem import filesystem_mcp
 
+from adapter.mcp.cache import CachingMCPServer
+from adapter.utils.disk_cache import cache_get, cache_key, cache_put, model_key
 from adapter.utils.savable import Savable
 
 
@@ -14,16 +18,9 @@ class FilePathsList(Savable):
     file_paths: list[str]
 
 
-async def list_document_filepaths(
-    local_dir: Path, model: AgentsSDKModel | None = None
-) -> FilePathsList:
-    if model is None:
-        model = get_aoai("gpt-5-mini")
-    async with filesystem_mcp([str(local_dir)]) as filesystem:
-        agent = AgentWrapper[FilePathsList].create(
-            name="file_path_finder",
-            instructions=dedent(
-                """\
+# Dedent the static instructions once at import instead of per call
+_INSTRUCTIONS = dedent(
+    """\
 You are a file path finder.
 Given a local path of clone repository, your task is to list all the useful documentation files for library learners in the repository.
 You have access to a file system mcp server that allows you to query repository contents.
@@ -42,17 +39,49 @@ Your response should be structured as following:
 }
 ```
 """,
-            ),
+)
+
+
+async def list_document_filepaths(
+    local_dir: Path,
+    model: AgentsSDKModel | None = None,
+    filesystem: MCPServerStdio | None = None,
+) -> FilePathsList:
+    if model is None:
+        model = get_aoai("gpt-5-mini")
+    # Build the input before entering the MCP context so the session is
+    # only open for the agent run itself
+    input_text = f"Local path: {local_dir}"
+    # The file listing only changes when the checkout does, so a disk hit
+    # skips both the MCP session and the crawl of the repository
+    key = cache_key("file_path_finder", model_key(model), _INSTRUCTIONS, input_text)
+    cached = cache_get(key)
+    if cached is not None:
+        return FilePathsList.model_validate_json(cached)
+    async with AsyncExitStack() as stack:
+        # Reuse a caller-provided MCP session when available instead of
+        # paying a subprocess spawn + handshake per call
+        if filesystem is None:
+            filesystem = CachingMCPServer(
+                await stack.enter_async_context(filesystem_mcp([str(local_dir)]))
+            )
+        agent = AgentWrapper[FilePathsList].create(
+            name="file_path_finder",
+            instructions=_INSTRUCTIONS,
             mcp_servers=[
                 filesystem,
             ],
             model=model,
             output_type=FilePathsList,
-            model_settings=ModelSettings(parallel_tool_calls=True),
+            # Single MCP server with batch_execute fan-out; parallel tool
+            # routing adds prompt overhead without extra concurrency
+            model_settings=ModelSettings(parallel_tool_calls=False),
         )
         result = await agent.run(
-            input=f"Local path: {local_dir}",
+            input=input_text,
             max_turns=30,
             time_out_seconds=600,
         )
-        return result.final_output()
+        file_paths = result.final_output()
+        cache_put(key, file_paths.model_dump_json())
+        return file_paths
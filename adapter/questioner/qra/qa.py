@@ -1,22 +1,19 @@
+import asyncio
+
 from pydantic import BaseModel
 from oai_utils.agent import AgentWrapper, AgentRunFailure, AgentsSDKModel
-from tenacity import AsyncRetrying, stop_after_attempt, retry_if_exception_type
 from adapter.models.problems import QAProblem
+from adapter.utils.agent_cache import cached_agent
+from adapter.utils.retry import retry_async
 from agents.mcp.server import MCPServerStdio
 from adapter.topic.topics import Topic
 from pathlib import Path
 from agents.model_settings import ModelSettings
 
 
-async def create_qa(
-    local_dir: Path,
-    file_path: str,
-    topic: Topic,
-    filesystem_mcp: MCPServerStdio,
-    model: AgentsSDKModel,
-    max_turns: int = 20,
-) -> QAProblem | None:
-    prompt = f"""\
+# Static portion of the create_qa instructions, built once at import; only the
+# turn budget sentence varies per call
+_CREATE_QA_INSTRUCTIONS = """\
 You are an expert Python technical interviewer and library documentation specialist.
 Your goal is to create a high-quality, self-contained question and answer pair based on the provided library documentation snippet.
 
@@ -36,14 +33,37 @@ You must output a single JSON object:
 
 ### Research Task
 Base the task on the content of the provided file path. Use the File System MCP to examine the base class definitions or related utility functions to ensure the 'answer' is technically accurate.
-You have {max_turns} turns to complete the task."""
-    agent = AgentWrapper[QAProblem].create(
-        name="qa_generator",
-        instructions=prompt,
-        model=model,
-        output_type=QAProblem,
-        mcp_servers=[filesystem_mcp],
-        model_settings=ModelSettings(parallel_tool_calls=True),
+"""
+
+
+async def create_qa(
+    local_dir: Path,
+    file_path: str,
+    topic: Topic,
+    filesystem_mcp: MCPServerStdio,
+    model: AgentsSDKModel,
+    max_turns: int = 6,
+) -> QAProblem | None:
+    prompt = (
+        _CREATE_QA_INSTRUCTIONS
+        + f"You have {max_turns} turns to complete the task."
+    )
+    # The MCP session is dynamic, so it is part of the cache key; agents are
+    # reused for the lifetime of a (session, model, turn budget) combination
+    agent = cached_agent(
+        f"qa_generator:{max_turns}:{id(filesystem_mcp)}",
+        model,
+        lambda: AgentWrapper[QAProblem].create(
+            name="qa_generator",
+            instructions=prompt,
+            model=model,
+            output_type=QAProblem,
+            mcp_servers=[filesystem_mcp],
+            # One server only, and batch_execute already fans out multi-file
+            # reads server-side; parallel tool routing would just inflate the
+            # tool-choice wrapper
+            model_settings=ModelSettings(parallel_tool_calls=False),
+        ),
     )
     input = f"""\
 Local path: {local_dir}
@@ -67,7 +87,7 @@ async def create_multiple_qas(
     topic: Topic,
     filesystem_mcp: MCPServerStdio,
     model: AgentsSDKModel,
-    max_turns: int = 20,
+    max_turns: int = 6,
 ) -> list[QAProblem]:
     prompt = """\
 You are an expert Python technical interviewer and library documentation specialist.
@@ -83,19 +103,13 @@ Your goal is to create one or more high-quality, self-contained question and ans
 2. **Goal-Oriented Scenarios**: Instead of asking "What are the targets?", frame the question as a specific task. Describe the desired outcome (e.g., "The developer wants to run only core logic tests while ensuring a specific dependency is bypassed").
 3. **No Meta-References**: Do not use phrases like "According to the document" as the solver has no access to it.
 
-### Examples of Desired Granularity and Depth:
+### Example of Desired Granularity and Depth:
 
-**Example 1 (Focus: Selective Testing & State)**
+**Example (Focus: Selective Testing & State)**
 - **Question**: "A developer wants to run the project's unit tests. However, they do not have the Rust development environment installed and need to ensure the test runner specifically skips any tests that require the native extension. What is the exact command and environment variable pair used to achieve this 'Python-only' test run?"
 - **Answer**: "The developer should run `SQLGLOTRS_TOKENIZER=0 make unit`. Setting the environment variable to 0 forces the pure-Python implementation, and the 'unit' target runs the standard library test suite."
 
-**Example 2 (Focus: Dependency Management)**
-- **Question**: "The project supports an alternative, faster Python package installer via a specific Makefile toggle. How does a contributor invoke the installation target so that it uses this optimized wrapper instead of standard pip?"
-- **Answer**: "The contributor should prefix the command with the `UV=1` environment variable, for example: `UV=1 make install-dev`. This tells the Makefile to alias the PIP command to 'uv pip'."
-
-**Example 3 (Focus: Structural Metadata)**
-- **Question**: "When inspecting an AST node's representation, some optional child keys are hidden to save space. Which specific instance method must be called to produce a fully verbose textual output that reveals every argument, including empty keys and object IDs?"
-- **Answer**: "The developer should call the `.to_s(verbose=True)` method. While `repr()` provides a compact view, `to_s` is the internal printer that supports a 'verbose' flag for debugging."
+Apply the same granularity to other kinds of mechanics (dependency toggles, structural metadata, private helper methods): describe the goal, ask for the exact name or command, never reveal it in the question.
 
 ### Output JSON Schema
 You must output a single JSON object containing a list of tasks:
@@ -110,14 +124,22 @@ You must output a single JSON object containing a list of tasks:
 
 ### Research Task
 Base the tasks on the provided file path. Use the File System MCP to verify the exact names of targets, variables, or private methods to ensure the 'answer' is technically accurate.
+When you need more than one file, use the `batch_execute` tool with a list of read operations instead of issuing them one by one.
 """
-    agent = AgentWrapper[QAGenerationOutput].create(
-        name="qa_generator",
-        instructions=prompt,
-        model=model,
-        output_type=QAGenerationOutput,
-        mcp_servers=[filesystem_mcp],
-        model_settings=ModelSettings(parallel_tool_calls=True),
+    agent = cached_agent(
+        f"multi_qa_generator:{id(filesystem_mcp)}",
+        model,
+        lambda: AgentWrapper[QAGenerationOutput].create(
+            name="qa_generator",
+            instructions=prompt,
+            model=model,
+            output_type=QAGenerationOutput,
+            mcp_servers=[filesystem_mcp],
+            # One server only, and batch_execute already fans out multi-file
+            # reads server-side; parallel tool routing would just inflate the
+            # tool-choice wrapper
+            model_settings=ModelSettings(parallel_tool_calls=False),
+        ),
     )
     input = f"""\
 Local path: {local_dir}
@@ -137,18 +159,14 @@ async def create_multiple_qas_retriable(
     topic: Topic,
     filesystem_mcp: MCPServerStdio,
     model: AgentsSDKModel,
-    max_turns: int = 20,
+    max_turns: int = 6,
 ) -> list[QAProblem]:
     try:
-        async for attempt in AsyncRetrying(
-            stop=stop_after_attempt(3),
-            retry=retry_if_exception_type(AgentRunFailure),
-            reraise=True,
-        ):
-            with attempt:
-                return await create_multiple_qas(
-                    local_dir, file_path, topic, filesystem_mcp, model, max_turns
-                )
-    except AgentRunFailure:
+        return await retry_async(
+            lambda: create_multiple_qas(
+                local_dir, file_path, topic, filesystem_mcp, model, max_turns
+            ),
+            retry_on=(AgentRunFailure, asyncio.TimeoutError),
+        )
+    except (AgentRunFailure, asyncio.TimeoutError):
         return []
-    return []  # Should not reach here
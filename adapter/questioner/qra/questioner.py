@@ -1,47 +1,119 @@
-from adapter.topic.filtering import is_useful_for_users
-from adapter.questioner.qra.reasoner import hindsight_reasoning_retriable
+import asyncio
+
+from adapter.topic.filtering import cached_usefulness, record_usefulness
 from async_utils import gather_with_semaphore
 from adapter.models.problems import QRA
-from adapter.questioner.qra.qa import create_multiple_qas_retriable
 from oai_utils.agent import AgentWrapper, AgentRunFailure, AgentsSDKModel
 from adapter.models.types import ProblemType
 from pydantic.main import BaseModel
 from agents.mcp.server import MCPServerStdio
+from agents.model_settings import ModelSettings
 from adapter.topic.topics import Topic
+from adapter.utils.agent_cache import cached_agent
+from adapter.utils.retry import retry_async
 from pathlib import Path
 from loguru import logger
 
 
-class DispatchResult(BaseModel):
+class TopicTriageOutput(BaseModel):
+    is_useful: bool
     problem_type: ProblemType
+    tasks: list[QRA]
+
+
+# Fused instructions: usefulness check, assessment-type dispatch and QA
+# generation in a single structured-output pass, so each topic costs one
+# agent round-trip instead of three sequential ones
+_TRIAGE_INSTRUCTIONS = """\
+You are an expert educator, technical writer and Python technical interviewer specialized in library documentation.
+For a given topic from library documentation, you perform three steps in a single pass.
+
+### Step 1: Usefulness
+Determine if the topic is useful for library learners (users who want to learn how to use the library).
+
+A topic is NOT useful if it is about:
+1. How to contribute to the library (e.g., development setup, pull request guidelines).
+2. LICENSE information.
+3. Changelogs or release notes.
+4. Internal architecture that users don't need to know.
+5. Administrative or project management details.
+6. Can not be tested as a form of programming exercise.
+
+A topic IS useful if it describes:
+1. Features, functions, classes, modules or concepts of the library.
+2. How to use specific parts of the library.
+3. Tutorials, examples, or guides for users.
+
+### Step 2: Assessment Type
+Choose the most suitable type of assessment:
+1. **programming**: the topic's understanding can be effectively assessed through coding tasks (e.g., implementing functions, algorithms, or using specific library features).
+2. **qa**: conceptual questions, definitions, or explanations.
+
+### Step 3: QRA Generation (only when the topic is useful)
+Create one or more high-quality, self-contained question/reasoning/answer triplets based on the provided library documentation snippet.
 
+- **Atomic Scope**: Each Q&A pair must focus on a single specific architectural concept or mechanic. If a document is complex, generate multiple separate Q&A pairs.
+- **Identify, Don't Explain**: Provide enough context to establish the scenario, but do not give away the logic, rules, or definitions. The solver must provide the expertise.
+- **Test for Recall**: Design questions that require the solver to provide specific syntax, command names, or variable names from memory based on a described goal.
+- **Contextual Setup**: Identify the specific modules or concepts involved so the question is self-contained, but do not explain the underlying logic or rules.
+- **No Meta-References**: Do not use phrases like "According to the document" as the solver has no access to it.
+- **Hindsight Reasoning**: For each pair, also write the reasoning of an expert who understands the library's design philosophy, performance trade-offs and implementation details: start from the question as if thinking from scratch, but construct a "stream of consciousness" path that logically and elegantly leads to the answer. Don't just restate the answer — explain the "why" and "how", connecting the scenario to broader library concepts or common pitfalls.
+
+Base the tasks on the provided file path. Use the File System MCP to verify the exact names of targets, variables, or private methods to ensure each 'answer' is technically accurate.
+When you need more than one file, use the `batch_execute` tool with a list of read operations instead of issuing them one by one.
 
-async def dispatch_topic(topic: Topic, model: AgentsSDKModel) -> ProblemType:
-    agent = AgentWrapper[DispatchResult].create(
-        name="problem_type_dispatcher",
-        instructions="""\
-You are an expert educational content designer.
-Your task is to determine the most suitable type of assessment for a given topic from library documentation.
-You must choose between two types of assessments: "programming" or "qa".
 ### Output JSON Schema
+You must output a single JSON object:
 {
-    "problem_type": "Either 'programming' or 'qa'. Choose 'programming' if the topic involves coding tasks, algorithms, or implementation details. Choose 'qa' for conceptual questions, definitions, or explanations."
+    "is_useful": "boolean. True if the topic is useful for library learners, False otherwise.",
+    "problem_type": "Either 'programming' or 'qa'.",
+    "tasks": [
+        {
+            "question": "A focused, self-contained scenario-based question that describes a goal without naming the solution.",
+            "reasoning": "An expert's hindsight reasoning path from the question to the answer.",
+            "answer": "A detailed explanation providing the specific syntax, targets, or variables required."
+        }
+    ]
 }
+When is_useful is false, return an empty tasks list and skip the research.
+"""
+
 
-### Guidelines
-1. **Programming**: Choose this type if the topic's understanding can be effectively assessed through coding tasks (e.g., implementing functions, algorithms, or using specific library features).
-2. **QA**: Choose this type for conceptual questions, definitions, or explanations.""",
-        output_type=DispatchResult,
-        model=model,
+async def triage_topic(
+    local_dir: Path,
+    file_path: str,
+    topic: Topic,
+    filesystem_mcp: MCPServerStdio,
+    model: AgentsSDKModel,
+    max_turns: int = 6,
+) -> TopicTriageOutput:
+    # The MCP session is dynamic, so it is part of the cache key; the agent is
+    # reused for the lifetime of a (session, model) combination
+    agent = cached_agent(
+        f"topic_triage:{id(filesystem_mcp)}",
+        model,
+        lambda: AgentWrapper[TopicTriageOutput].create(
+            name="topic_triage",
+            instructions=_TRIAGE_INSTRUCTIONS,
+            model=model,
+            output_type=TopicTriageOutput,
+            mcp_servers=[filesystem_mcp],
+            # One server only, and batch_execute already fans out multi-file
+            # reads server-side; parallel tool routing would just inflate the
+            # tool-choice wrapper
+            model_settings=ModelSettings(parallel_tool_calls=False),
+        ),
     )
-    ret = await agent.run(
-        input=f"""\
-Based on the following topic from library documentation, determine the most suitable type of assessment.
+    input_text = f"""\
+Local path: {local_dir}
+File path: {file_path}
 Topic title: {topic.title}
-Topic description: {topic.description}""",
+Topic description: {topic.description}"""
+    ret = await agent.run(
+        input=input_text,
+        max_turns=max_turns,
     )
-    result = ret.final_output()
-    return result.problem_type
+    return ret.final_output()
 
 
 async def questioner(
@@ -51,50 +123,28 @@ async def questioner(
     filesystem_mcp: MCPServerStdio,
     model: AgentsSDKModel,
 ) -> list[QRA] | None:
-    if not await is_useful_for_users(topic, model):
-        logger.info(f"Skipping topic as it is not useful for users: {topic.title}")
-        return None
-
-    # problem_type = await dispatch_topic(topic)
-    problem_type: ProblemType = "qa"
-
     try:
-        if problem_type == "qa":
-            logger.info(f"Creating QA problem for topic: {topic.title}")
-            qas = await create_multiple_qas_retriable(
-                local_dir, file_path, topic, filesystem_mcp, model
-            )
-            reasonings = await gather_with_semaphore(
-                [
-                    hindsight_reasoning_retriable(
-                        qa,
-                        local_dir,
-                        file_path,
-                        filesystem_mcp=filesystem_mcp,
-                        model=model,
-                    )
-                    for qa in qas
-                ],
-                3,
-            )
-            results = []
-            for qa, reasoning in zip(qas, reasonings):
-                if reasoning is not None:
-                    results.append(
-                        QRA(question=qa.question, answer=qa.answer, reasoning=reasoning)
-                    )
-            return results
-        # elif problem_type == "programming":
-        #     logger.info(f"Creating coding task for topic: {topic.title}")
-        #     return [
-        #         await create_coding_task(local_dir, file_path, topic, filesystem_mcp)
-        #     ]
-        else:
-            logger.error(
-                f"Unknown problem type '{problem_type}' for topic: {topic.title}"
-            )
+        # A previously stored not-useful verdict skips the agent call entirely
+        if cached_usefulness(topic) is False:
+            logger.info(f"Skipping topic (cached as not useful): {topic.title}")
             return None
-    except AgentRunFailure as e:
+
+        # One fused agent call covers the usefulness check, the problem-type
+        # dispatch and the QA generation
+        triage = await retry_async(
+            lambda: triage_topic(local_dir, file_path, topic, filesystem_mcp, model),
+            retry_on=(AgentRunFailure, asyncio.TimeoutError),
+        )
+        record_usefulness(topic, triage.is_useful)
+        if not triage.is_useful:
+            logger.info(f"Skipping topic as it is not useful for users: {topic.title}")
+            return None
+
+        logger.info(f"Creating QA problem for topic: {topic.title}")
+        # Reasoning arrives fused with each task, so a topic costs exactly
+        # one agent call; hindsight_reasoning remains available for backfill
+        return triage.tasks
+    except (AgentRunFailure, asyncio.TimeoutError) as e:
         logger.warning(f"Agent failed to create task for topic: {topic.title}: {e}")
         return None
     except Exception as e:
@@ -102,3 +152,25 @@ async def questioner(
             f"Unexpected error during problem creation for topic: {topic.title}: {e}"
         )
         return None
+
+
+async def questioner_batch(
+    local_dir: Path,
+    items: list[tuple[str, Topic]],
+    filesystem_mcp: MCPServerStdio,
+    model: AgentsSDKModel,
+    max_concurrency: int = 16,
+) -> list[list[QRA] | None]:
+    """Run questioner over many (file_path, topic) pairs concurrently.
+
+    The per-topic agent calls are independent network-bound work, so a
+    semaphore-bounded gather preserves input order while keeping the LLM
+    backend saturated.
+    """
+    return await gather_with_semaphore(
+        [
+            questioner(local_dir, file_path, topic, filesystem_mcp, model)
+            for file_path, topic in items
+        ],
+        max_concurrency,
+    )
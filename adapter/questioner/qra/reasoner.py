@@ -1,25 +1,21 @@
+import asyncio
+
 from pydantic import BaseModel
 from adapter.models.problems import QAProblem
 from oai_utils.agent import AgentWrapper, AgentRunFailure, AgentsSDKModel
 from agents.mcp.server import MCPServerStdio
 from agents.model_settings import ModelSettings
 from pathlib import Path
-from tenacity import AsyncRetrying, stop_after_attempt, retry_if_exception_type
+
+from adapter.utils.agent_cache import cached_agent
+from adapter.utils.retry import retry_async
 
 
 class ReasoningOutput(BaseModel):
     reasoning: str
 
 
-async def hindsight_reasoning(
-    qa: QAProblem,
-    local_dir: Path,
-    file_path: str,
-    filesystem_mcp: MCPServerStdio,
-    model: AgentsSDKModel,
-    max_turns: int = 20,
-) -> str:
-    prompt = """\
+_REASONING_PREAMBLE = """\
 You are an expert Python developer with a deep, perfect memory of library APIs and internal mechanics.
 Your task is to provide a "hindsight reasoning" process for a given question and its answer.
 
@@ -30,17 +26,70 @@ Your task is to provide a "hindsight reasoning" process for a given question and
     - However, because you know the 'answer', you must construct a reasoning path that logically and elegantly leads to that answer.
     - Your reasoning should feel like a "stream of consciousness" from an expert who is connecting the dots between the question's scenario and the library's underlying principles.
 3.  **Depth**: Don't just restate the answer. Explain the "why" and "how". Connect the question to broader library concepts or common pitfalls.
-4.  **Verification (Optional)**: Use the File System MCP ONLY if needed to examine the library's source code, base class definitions, or related utility functions to ensure your reasoning is technically accurate and well-supported. If the question and answer are already clear and you're confident in the mechanics, you don't have to use MCP tools.
+"""
+
+_REASONING_INSTRUCTIONS_WITH_FS = (
+    _REASONING_PREAMBLE
+    + """\
+4.  **Verification (Optional)**: Use the File System MCP ONLY if needed to examine the library's source code, base class definitions, or related utility functions to ensure your reasoning is technically accurate and well-supported. If the question and answer are already clear and you're confident in the mechanics, you don't have to use MCP tools. When you do need more than one file, use the `batch_execute` tool with a list of read operations instead of issuing them one by one.
 5.  **Formatting**: Output the reasoning process in the `reasoning` field of the structured output. Do not include the original question or answer in your output, just the reasoning process itself."""
+)
 
-    agent = AgentWrapper[ReasoningOutput].create(
-        name="hindsight_reasoner",
-        instructions=prompt,
-        model=model,
-        output_type=ReasoningOutput,
-        mcp_servers=[filesystem_mcp],
-        model_settings=ModelSettings(parallel_tool_calls=True),
-    )
+_REASONING_INSTRUCTIONS_NO_FS = (
+    _REASONING_PREAMBLE
+    + """\
+4.  **Formatting**: Output the reasoning process in the `reasoning` field of the structured output. Do not include the original question or answer in your output, just the reasoning process itself."""
+)
+
+# Answers longer than this are assumed detailed enough to reason about
+# without re-reading the sources
+_FS_ANSWER_THRESHOLD = 400
+
+
+def _needs_filesystem(qa: QAProblem) -> bool:
+    return len(qa.answer) < _FS_ANSWER_THRESHOLD or "code" in qa.answer.lower()
+
+
+async def hindsight_reasoning(
+    qa: QAProblem,
+    local_dir: Path,
+    file_path: str,
+    filesystem_mcp: MCPServerStdio,
+    model: AgentsSDKModel,
+    max_turns: int = 6,
+) -> str:
+    # Attaching the MCP inflates every prompt with the tool schema and
+    # invites needless tool calls; skip it when the answer looks
+    # self-contained
+    if _needs_filesystem(qa):
+        # The MCP session is dynamic, so it is part of the cache key; the
+        # agent is reused for the lifetime of a (session, model) combination
+        agent = cached_agent(
+            f"hindsight_reasoner:{id(filesystem_mcp)}",
+            model,
+            lambda: AgentWrapper[ReasoningOutput].create(
+                name="hindsight_reasoner",
+                instructions=_REASONING_INSTRUCTIONS_WITH_FS,
+                model=model,
+                output_type=ReasoningOutput,
+                mcp_servers=[filesystem_mcp],
+                # One server only, and batch_execute already fans out
+                # multi-file reads server-side; parallel tool routing would
+                # just inflate the tool-choice wrapper
+                model_settings=ModelSettings(parallel_tool_calls=False),
+            ),
+        )
+    else:
+        agent = cached_agent(
+            "hindsight_reasoner_nofs",
+            model,
+            lambda: AgentWrapper[ReasoningOutput].create(
+                name="hindsight_reasoner",
+                instructions=_REASONING_INSTRUCTIONS_NO_FS,
+                model=model,
+                output_type=ReasoningOutput,
+            ),
+        )
 
     input_text = f"""\
 Local path: {local_dir}
@@ -61,18 +110,14 @@ async def hindsight_reasoning_retriable(
     file_path: str,
     filesystem_mcp: MCPServerStdio,
     model: AgentsSDKModel,
-    max_turns: int = 20,
+    max_turns: int = 6,
 ) -> str | None:
     try:
-        async for attempt in AsyncRetrying(
-            stop=stop_after_attempt(3),
-            retry=retry_if_exception_type(AgentRunFailure),
-            reraise=True,
-        ):
-            with attempt:
-                return await hindsight_reasoning(
-                    qa, local_dir, file_path, filesystem_mcp, model, max_turns
-                )
-    except AgentRunFailure:
+        return await retry_async(
+            lambda: hindsight_reasoning(
+                qa, local_dir, file_path, filesystem_mcp, model, max_turns
+            ),
+            retry_on=(AgentRunFailure, asyncio.TimeoutError),
+        )
+    except (AgentRunFailure, asyncio.TimeoutError):
         return None
-    return None
@@ -7,12 +7,15 @@ from typing import Self
 
 from agents.agent import StopAtTools
 from oai_utils.agent import AgentWrapper
+
+from adapter.utils.agent_cache import cached_agent
 from adapter.env import (
     ProgrammingEnvironment,
     read_file,
     run_command,
     submit,
     write_file,
+    write_files,
 )
 from swerex.deployment.abstract import AbstractDeployment
 
@@ -23,7 +26,18 @@ class ProblemSolver:
 
     @classmethod
     def create(cls, model: AgentsSDKModel) -> Self:
-        agent = AgentWrapper[str].create(
+        # MCP-free agent with static instructions and tools: one instance per
+        # model is enough; the per-run environment travels via context
+        agent = cached_agent(
+            "programming_environment_agent",
+            model,
+            lambda: cls._create_agent(model),
+        )
+        return cls(agent=agent)
+
+    @classmethod
+    def _create_agent(cls, model: AgentsSDKModel) -> AgentWrapper[str]:
+        return AgentWrapper[str].create(
             name="programming_environment_agent",
             instructions=dedent("""\
         You are a programming environment agent that can read and write files, and run commands
@@ -31,19 +45,20 @@ class ProblemSolver:
         You have access to the following tools:
         1. read_file(path: str) -> str: Reads the content of a file at the given path.
         2. write_file(path: str, content: str) -> None: Writes the given content to a file at the specified path.
-        3. run_command(bash_command: str) -> str: Runs a command in the environment and returns its output.
-        4. submit() -> str: Finalizes the programming environment session. Should be called when you are done.
+        3. write_files(files: dict[str, str]) -> None: Writes several files in one call. Prefer this when creating multiple files at once.
+        4. run_command(bash_command: str) -> str: Runs a command in the environment and returns its output.
+        5. submit() -> str: Finalizes the programming environment session. Should be called when you are done.
         """),
             model=model,
             tool_use_behavior=StopAtTools(stop_at_tool_names=["submit"]),
             tools=[
                 read_file,
                 write_file,
+                write_files,
                 run_command,
                 submit,
             ],
         )
-        return cls(agent=agent)
 
     async def solve[T: AbstractDeployment](
         self, problem_statement: VerifiableProblem, env: ProgrammingEnvironment[T]
@@ -1,4 +1,8 @@
+import os
+
 from adapter.topic.topics import Topic
+from adapter.utils.agent_cache import cached_agent
+from adapter.utils.disk_cache import cache_get, cache_key, cache_put
 from loguru import logger
 from pydantic import BaseModel
 from oai_utils.agent import AgentWrapper, AgentsSDKModel
@@ -9,10 +13,48 @@ class UsefulnessResult(BaseModel):
     reason: str
 
 
+# Topics repeat across runs and crawls; verdicts persist in the shared
+# sqlite disk cache keyed on topic content, so each unique topic costs one
+# LLM call, ever — and each verdict is one keyed insert rather than a
+# rewrite of a whole cache file. Set TOPIC_USEFULNESS_CACHE=0 to disable
+# (e.g. in tests).
+_CACHE_ENABLED = os.environ.get("TOPIC_USEFULNESS_CACHE", "1") != "0"
+
+
+def _topic_key(topic: Topic) -> bytes:
+    return cache_key(
+        "topic_usefulness", topic.title.strip(), topic.description.strip()
+    )
+
+
+def cached_usefulness(topic: Topic) -> bool | None:
+    """Return the stored verdict for this topic, or None if unknown."""
+    if not _CACHE_ENABLED:
+        return None
+    value = cache_get(_topic_key(topic))
+    return None if value is None else value == "1"
+
+
+def record_usefulness(topic: Topic, is_useful: bool) -> None:
+    """Persist a usefulness verdict so identical topics skip the LLM call."""
+    if not _CACHE_ENABLED:
+        return
+    cache_put(_topic_key(topic), "1" if is_useful else "0")
+
+
 async def is_useful_for_users(topic: Topic, model: AgentsSDKModel) -> bool:
-    agent = AgentWrapper[UsefulnessResult].create(
-        name="topic_usefulness_checker",
-        instructions="""\
+    cached = cached_usefulness(topic)
+    if cached is not None:
+        logger.info(f"Topic '{topic.title}' usefulness (cached): {cached}")
+        return cached
+    # The agent has no per-call state (no MCP servers), so one instance per
+    # model is reused across all topics
+    agent = cached_agent(
+        "topic_usefulness_checker",
+        model,
+        lambda: AgentWrapper[UsefulnessResult].create(
+            name="topic_usefulness_checker",
+            instructions="""\
 You are an expert educator and technical writer.
 Your task is to determine if a given topic from library documentation is useful for library learners (users who want to learn how to use the library).
 
@@ -34,8 +76,9 @@ A topic IS useful if it describes:
     "is_useful": "boolean. True if the topic is useful for library learners, False otherwise.",
     "reason": "A brief explanation of why the topic is or is not useful."
 }""",
-        output_type=UsefulnessResult,
-        model=model,
+            output_type=UsefulnessResult,
+            model=model,
+        ),
     )
     ret = await agent.run(
         input=f"""\
@@ -47,4 +90,5 @@ Topic description: {topic.description}""",
     logger.info(
         f"Topic '{topic.title}' usefulness: {result.is_useful}. Reason: {result.reason}"
     )
+    record_usefulness(topic, result.is_useful)
     return result.is_useful
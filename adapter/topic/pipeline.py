@@ -0,0 +1,88 @@
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+from loguru import logger
+from oai_utils.agent import AgentRunFailure, AgentsSDKModel
+
+from adapter.find_topic import find_topics_for_files
+from adapter.questioner.qra.finder import list_document_filepaths
+from adapter.topic.topics import TopicEntities, TopicEntity, Topics
+from adapter.utils.retry import retry_async
+
+
+async def iter_topic_entities(
+    repo_path: Path,
+    *,
+    model: AgentsSDKModel | None = None,
+    max_concurrency: int = 3,
+    batch_size: int = 8,
+) -> AsyncIterator[TopicEntity]:
+    """Stream TopicEntity items for every documentation file in a checkout.
+
+    Files are grouped batch_size per agent call — amortizing per-call
+    latency and reusing the cached instruction prefix — with up to
+    max_concurrency chunks in flight. Entities are yielded as each chunk
+    finishes, so consumers start working while later files are still being
+    read instead of waiting for the whole extraction.
+    """
+    file_paths = await list_document_filepaths(repo_path, model=model)
+    logger.info(f"Found {len(file_paths.file_paths)} document files")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def find_chunk(chunk: list[str]) -> list[tuple[str, Topics]]:
+        async with semaphore:
+            try:
+                # Backoff on 429/5xx/timeouts: at higher concurrency the
+                # provider will shed load occasionally, and one flaky chunk
+                # should not cost the whole extraction
+                per_file = await retry_async(
+                    lambda: find_topics_for_files(repo_path, chunk, model=model),
+                    retry_on=(AgentRunFailure, asyncio.TimeoutError),
+                )
+            except (AgentRunFailure, asyncio.TimeoutError) as e:
+                logger.warning(f"Topic extraction failed for chunk {chunk}: {e}")
+                return []
+            return list(zip(chunk, per_file))
+
+    chunks = [
+        file_paths.file_paths[i : i + batch_size]
+        for i in range(0, len(file_paths.file_paths), batch_size)
+    ]
+    for done in asyncio.as_completed([find_chunk(chunk) for chunk in chunks]):
+        for file_path, topics in await done:
+            for topic in topics.topics:
+                yield TopicEntity(file_path=file_path, topic=topic)
+
+
+async def build_topic_entities(
+    repo_path: Path,
+    *,
+    model: AgentsSDKModel | None = None,
+    max_concurrency: int = 3,
+    save_path: Path | None = None,
+) -> TopicEntities:
+    """Extract (or reload) the full topic list for a repository.
+
+    The "list files, find topics per file, flatten, persist" pipeline used
+    to be copy-pasted into every entry-point script; this is the one shared
+    implementation. When save_path already exists the stored extraction is
+    loaded instead of re-crawling the repository.
+    """
+    if save_path is not None and save_path.exists():
+        logger.info(f"Loading existing topics from {save_path}")
+        # We wrote this file ourselves; skip per-entity re-validation when
+        # the integrity digest checks out
+        return TopicEntities.load_trusted(save_path)
+    entities = TopicEntities(
+        topics=[
+            entity
+            async for entity in iter_topic_entities(
+                repo_path, model=model, max_concurrency=max_concurrency
+            )
+        ]
+    )
+    if save_path is not None:
+        logger.info(f"Extracted {len(entities.topics)} topics, saving to {save_path}")
+        entities.save(save_path)
+    return entities
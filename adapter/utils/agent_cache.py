@@ -0,0 +1,18 @@
+from typing import Callable
+
+_cache: dict[tuple[str, object], object] = {}
+
+
+def cached_agent[T](name: str, model: object, factory: Callable[[], T]) -> T:
+    """Return a memoized agent for (name, model), building it on first use.
+
+    Agent construction compiles the output-type schema and model settings, so
+    agents without per-call MCP servers are reusable across invocations.
+    Unhashable model objects are keyed by identity.
+    """
+    key = (name, model if isinstance(model, str) else id(model))
+    agent = _cache.get(key)
+    if agent is None:
+        agent = factory()
+        _cache[key] = agent
+    return agent  # type: ignore[return-value]
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Awaitable
+
+# Rough chars-per-token ratio for English/code prompts; close enough for
+# budget pacing, which only needs relative sizes to be right
+_CHARS_PER_TOKEN = 4
+# Flat allowance for the model's response and the instruction prefix,
+# which the caller's input text does not include
+_RESPONSE_ALLOWANCE = 2048
+
+
+def estimate_credits(*texts: str) -> int:
+    """Cheap token estimate for sizing a CreditSemaphore transaction."""
+    return sum(len(text) for text in texts) // _CHARS_PER_TOKEN + _RESPONSE_ALLOWANCE
+
+
+class CreditSemaphore:
+    """Budget-based gate for LLM fan-out, metered in estimated tokens.
+
+    Providers rate-limit by tokens per minute, not request count, so a
+    fixed count cap sized for worst-case prompts leaves most of the budget
+    idle on small ones. Callers acquire a number of credits proportional
+    to their request size; the credits are handed back refund_time seconds
+    after acquisition — approximating the provider's sliding window —
+    regardless of how long the call itself runs.
+
+    Waiters are served in FIFO order (asyncio.Condition wakes them fairly),
+    so small requests cannot starve a large one indefinitely.
+    """
+
+    def __init__(self, total_credits: int, refund_time: float = 60.0) -> None:
+        self._capacity = total_credits
+        self._available = total_credits
+        self._refund_time = refund_time
+        self._condition = asyncio.Condition()
+        self._refunds: set[asyncio.Task[None]] = set()
+
+    async def _refund(self, credits: int) -> None:
+        await asyncio.sleep(self._refund_time)
+        async with self._condition:
+            self._available = min(self._capacity, self._available + credits)
+            self._condition.notify_all()
+
+    async def acquire(self, credits: int) -> None:
+        # A single oversized request must still be able to run
+        credits = min(credits, self._capacity)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._available >= credits)
+            self._available -= credits
+        refund = asyncio.create_task(self._refund(credits))
+        self._refunds.add(refund)
+        refund.add_done_callback(self._refunds.discard)
+
+    async def transact[T](self, awaitable: Awaitable[T], credits: int) -> T:
+        """Run one awaitable once its estimated token cost fits the budget."""
+        await self.acquire(credits)
+        return await awaitable
@@ -0,0 +1,74 @@
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+
+from loguru import logger
+
+# Structured agent outputs are pure functions of (model, instructions, input
+# text), so an exact-match disk cache makes re-runs free for unchanged
+# inputs. Set LLM_DISK_CACHE=0 to disable (e.g. in tests); clear the file
+# when the underlying repository content changes, since keys carry paths,
+# not file contents.
+_CACHE_ENABLED = os.environ.get("LLM_DISK_CACHE", "1") != "0"
+_CACHE_PATH = Path(os.environ.get("LLM_DISK_CACHE_PATH", ".cache/llm_cache.sqlite"))
+
+_conn: sqlite3.Connection | None = None
+_disabled = False
+
+
+def model_key(model: object) -> str:
+    """A process-stable string identifying the model for cache keys."""
+    if isinstance(model, str):
+        return model
+    name = getattr(model, "model", None)
+    return name if isinstance(name, str) else type(model).__name__
+
+
+def cache_key(*parts: str) -> bytes:
+    return hashlib.sha256("\x00".join(parts).encode()).digest()
+
+
+def _connection() -> sqlite3.Connection | None:
+    global _conn, _disabled
+    if _disabled or not _CACHE_ENABLED:
+        return None
+    if _conn is None:
+        try:
+            _CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            _conn = sqlite3.connect(_CACHE_PATH, check_same_thread=False)
+            # WAL keeps concurrent readers unblocked during writes
+            _conn.execute("PRAGMA journal_mode=WAL")
+            _conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, value TEXT)"
+            )
+            _conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"LLM disk cache unavailable: {e}")
+            _disabled = True
+            return None
+    return _conn
+
+
+def cache_get(key: bytes) -> str | None:
+    """Return the stored JSON payload for this key, or None on a miss."""
+    conn = _connection()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
+
+
+def cache_put(key: bytes, value: str) -> None:
+    """Persist a JSON payload so identical inputs skip the LLM call."""
+    conn = _connection()
+    if conn is None:
+        return
+    try:
+        conn.execute("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, value))
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to persist LLM cache entry: {e}")
@@ -0,0 +1,82 @@
+import asyncio
+import random
+from typing import Awaitable, Callable
+
+# Markers of transient provider/transport failures worth retrying; schema or
+# auth problems fail identically on every attempt and are excluded
+_TRANSIENT_MARKERS = (
+    "rate limit",
+    "rate_limit",
+    "too many requests",
+    "429",
+    "500",
+    "502",
+    "503",
+    "504",
+    "timeout",
+    "timed out",
+    "connection reset",
+    "temporarily unavailable",
+    "overloaded",
+)
+_PERMANENT_MARKERS = (
+    "validation",
+    "schema",
+    "invalid_api_key",
+    "authentication",
+    "unauthorized",
+    "401",
+    "403",
+    "404",
+)
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Best-effort classification of an exception as retryable.
+
+    Walks the exception and its causes looking for rate-limit / 5xx /
+    timeout markers; validation, schema and auth failures are treated as
+    permanent even when wrapped.
+    """
+    seen: set[int] = set()
+    current: BaseException | None = exc
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, (asyncio.TimeoutError, ConnectionError)):
+            return True
+        text = f"{type(current).__name__}: {current}".lower()
+        if any(marker in text for marker in _PERMANENT_MARKERS):
+            return False
+        if any(marker in text for marker in _TRANSIENT_MARKERS):
+            return True
+        current = current.__cause__ or current.__context__
+    # Unclassifiable failures stay retryable: agent runs also die on flaky
+    # tool transports that surface without a recognizable status
+    return True
+
+
+async def retry_async[T](
+    coro_factory: Callable[[], Awaitable[T]],
+    retry_on: type[BaseException] | tuple[type[BaseException], ...],
+    attempts: int = 3,
+    base_delay: float = 2.0,
+    max_delay: float = 10.0,
+    should_retry: Callable[[BaseException], bool] = is_transient,
+) -> T:
+    """Retry an async call with exponential backoff plus jitter.
+
+    Only exceptions listed in retry_on that should_retry classifies as
+    transient are retried; anything else propagates immediately. Backoff
+    uses asyncio.sleep, so the event loop is never blocked between attempts,
+    and the jitter avoids synchronized retry storms under gather fan-out.
+    """
+    for attempt in range(attempts):
+        try:
+            return await coro_factory()
+        except retry_on as exc:
+            if attempt == attempts - 1 or not should_retry(exc):
+                raise
+            await asyncio.sleep(
+                min(max_delay, base_delay * 2**attempt) + random.random()
+            )
+    raise RuntimeError("unreachable")
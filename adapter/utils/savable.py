@@ -1,13 +1,70 @@
+import hashlib
+import json
 from pathlib import Path
-from typing import Self
+from typing import Self, get_args, get_origin
 
 from pydantic import BaseModel
 
 
+def _construct(model_cls: type[BaseModel], data: dict) -> BaseModel:
+    """Recursively build a model without validation from trusted data.
+
+    model_construct does not recurse, so nested models and lists of models
+    (the shapes our Savables use) are constructed explicitly; anything else
+    is passed through as-is.
+    """
+    fields = {}
+    for name, field in model_cls.model_fields.items():
+        value = data.get(name)
+        annotation = field.annotation
+        if (
+            isinstance(annotation, type)
+            and issubclass(annotation, BaseModel)
+            and isinstance(value, dict)
+        ):
+            value = _construct(annotation, value)
+        elif get_origin(annotation) is list and isinstance(value, list):
+            (item_type,) = get_args(annotation)
+            if isinstance(item_type, type) and issubclass(item_type, BaseModel):
+                value = [
+                    _construct(item_type, item) if isinstance(item, dict) else item
+                    for item in value
+                ]
+        fields[name] = value
+    return model_cls.model_construct(**fields)
+
+
+def _digest_path(path: Path) -> Path:
+    return path.with_suffix(path.suffix + ".sha256")
+
+
 class Savable(BaseModel):
     def save(self, path: Path) -> None:
-        path.write_text(self.model_dump_json())
+        # pydantic-core serializes straight to JSON bytes in Rust; taking
+        # them from the serializer skips the intermediate Python str and
+        # the UTF-8 re-encode write_text would do on every periodic save
+        payload = self.__pydantic_serializer__.to_json(self)
+        path.write_bytes(payload)
+        # Integrity digest consumed by load_trusted
+        _digest_path(path).write_text(hashlib.sha256(payload).hexdigest())
 
     @classmethod
     def load(cls, path: Path) -> Self:
-        return cls.model_validate_json(path.read_text())
+        return cls.model_validate_json(path.read_bytes())
+
+    @classmethod
+    def load_trusted(cls, path: Path) -> Self:
+        """Load skipping validation when the payload matches its saved digest.
+
+        Files we wrote ourselves don't need re-validating on every warm
+        start; the sha256 sidecar guards against truncated or hand-edited
+        payloads, which fall back to the validating load.
+        """
+        payload = path.read_bytes()
+        try:
+            expected = _digest_path(path).read_text().strip()
+        except OSError:
+            expected = None
+        if expected != hashlib.sha256(payload).hexdigest():
+            return cls.model_validate_json(payload)
+        return _construct(cls, json.loads(payload))  # type: ignore[return-value]
@@ -1,5 +1,11 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Callable
+from uuid import uuid4
+
 from oai_utils.client import get_aoai
 from adapter.models.problems import QRA
+from swerex.runtime.abstract import AbstractRuntime
 from swerex.runtime.abstract import Command
 from swerex.runtime.abstract import WriteFileRequest
 from swerex.runtime.abstract import CreateBashSessionRequest
@@ -8,32 +14,149 @@ from swerex.deployment.abstract import AbstractDeployment
 from pydantic import BaseModel
 from oai_utils.agent import AgentWrapper
 
+from adapter.utils.agent_cache import cached_agent
+from adapter.utils.disk_cache import cache_get, cache_key, cache_put
+
+
+# Wall-clock budget for one verification run, in seconds
+_TEST_TIMEOUT = 60.0
+
+# Budget for the post-run rm; deliberately short, since the usual way to
+# reach cleanup after a timeout is a runtime that has stopped responding
+_CLEANUP_TIMEOUT = 10.0
+
+
+def _combined_code(problem: VerifiableProblem) -> str:
+    """Inline the test code below the solution, both verbatim.
+
+    One file means one write and one interpreter start per problem; the test
+    code sees the solution's names directly in the same module. Neither part
+    is reindented — shifting the test code would corrupt any multi-line
+    string literals it contains.
+    """
+    return f"{problem.canonical_solution}\n\n{problem.test_code}\n"
+
+
+async def verify_problem_in_runtime(
+    problem: VerifiableProblem, runtime: AbstractRuntime
+) -> bool:
+    """Verifies one problem against an already-started runtime.
+
+    A unique filename per call allows several verifications to share the
+    same sandbox concurrently.
+    """
+    path = f"combined_{uuid4().hex}.py"
+    await runtime.write_file(
+        WriteFileRequest(path=path, content=_combined_code(problem))
+    )
+    # A hard wall clock keeps a looping canonical solution from hanging the
+    # pipeline: the Command timeout kills the process inside the sandbox, and
+    # wait_for is the outer safety net should the runtime itself stall
+    try:
+        result = await asyncio.wait_for(
+            runtime.execute(
+                Command(command=["python", "-I", path], timeout=_TEST_TIMEOUT)
+            ),
+            timeout=_TEST_TIMEOUT + 15,
+        )
+        return result.exit_code == 0
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        # Sandboxes are long-lived when pooled; don't let files pile up.
+        # Best effort only: the rm gets its own short budget and any
+        # failure is swallowed so it can never hang the pipeline or
+        # replace the verdict being returned
+        with suppress(Exception):
+            await asyncio.wait_for(
+                runtime.execute(
+                    Command(command=["rm", "-f", path], timeout=_CLEANUP_TIMEOUT)
+                ),
+                timeout=_CLEANUP_TIMEOUT + 5,
+            )
+
 
 async def verify_problem(
     problem: VerifiableProblem, deployment: AbstractDeployment
 ) -> bool:
     """Verifies the provided problem by running the test code against the canonical solution."""
     await deployment.start()
+    await deployment.runtime.create_session(CreateBashSessionRequest())
+    success = await verify_problem_in_runtime(problem, deployment.runtime)
+    await deployment.stop()
+
+    return success
+
+
+async def verify_problems(
+    problems: list[VerifiableProblem], deployment: AbstractDeployment
+) -> list[bool]:
+    """Verifies a batch of problems against a single deployment.
+
+    The deployment and bash session are started once and reused, so a batch
+    of M problems costs one startup plus M test runs instead of M startups.
+    """
+    await deployment.start()
     runtime = deployment.runtime
 
     await runtime.create_session(CreateBashSessionRequest())
-    # Prepare the submission code
-    submission_code = problem.canonical_solution + "\n"
+    results = [
+        await verify_problem_in_runtime(problem, runtime) for problem in problems
+    ]
+    await deployment.stop()
 
-    await runtime.write_file(
-        WriteFileRequest(path="submission.py", content=submission_code)
-    )
-    # Prepare the test code
-    await runtime.write_file(
-        WriteFileRequest(path="test.py", content=problem.test_code)
-    )
+    return results
 
-    # Execute the test script
-    result = await runtime.execute(Command(command=["python", "test.py"]))
-    success = result.exit_code == 0
-    await deployment.stop()
 
-    return success
+class DeploymentPool:
+    """A pool of pre-started deployments for concurrent batch verification.
+
+    K deployments are started once and handed out through a queue, so a
+    batch of M problems costs K startups plus M test runs instead of one
+    container startup per problem.
+    """
+
+    def __init__(
+        self, factory: Callable[[], AbstractDeployment], size: int = 4
+    ) -> None:
+        self._factory = factory
+        self._size = size
+        self._deployments: list[AbstractDeployment] = []
+        self._queue: asyncio.Queue[AbstractDeployment] = asyncio.Queue()
+
+    async def start(self) -> None:
+        async def start_one() -> None:
+            deployment = self._factory()
+            await deployment.start()
+            await deployment.runtime.create_session(CreateBashSessionRequest())
+            self._deployments.append(deployment)
+            self._queue.put_nowait(deployment)
+
+        await asyncio.gather(*(start_one() for _ in range(self._size)))
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(d.stop() for d in self._deployments))
+        self._deployments.clear()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AbstractRuntime]:
+        """Rent a warm runtime from the pool for arbitrary verification work."""
+        deployment = await self._queue.get()
+        try:
+            yield deployment.runtime
+        finally:
+            self._queue.put_nowait(deployment)
+
+    async def verify(self, problem: VerifiableProblem) -> bool:
+        async with self.acquire() as runtime:
+            return await verify_problem_in_runtime(problem, runtime)
+
+    async def verify_many(self, problems: list[VerifiableProblem]) -> list[bool]:
+        await self.start()
+        try:
+            return list(await asyncio.gather(*(self.verify(p) for p in problems)))
+        finally:
+            await self.stop()
 
 
 class QRAVerificationOutput(BaseModel):
@@ -41,9 +164,7 @@ class QRAVerificationOutput(BaseModel):
     feedback: str
 
 
-async def verify_qra(qra: QRA) -> tuple[bool, str]:
-    """Verifies the provided QRA triplet using an LLM to check for logical consistency of the reasoning."""
-    prompt = """\
+_QRA_VERIFICATION_INSTRUCTIONS = """\
 You are an expert technical evaluator. Your task is to verify the logical consistency of the "Reasoning" process in a Question-Reasoning-Answer (QRA) triplet.
 
 ### Context:
@@ -62,19 +183,56 @@ You must output a JSON object with:
 - `feedback`: A brief explanation of your decision, especially if the reasoning is weak, disconnected, or circular.
 """
 
-    agent = AgentWrapper[QRAVerificationOutput].create(
-        name="qra_evaluator",
-        instructions=prompt,
-        model=get_aoai("gpt-5-mini"),
-        output_type=QRAVerificationOutput,
-    )
 
+async def verify_qra(qra: QRA) -> tuple[bool, str]:
+    """Verifies the provided QRA triplet using an LLM to check for logical consistency of the reasoning."""
     input_text = f"""\
 Question: {qra.question}
 Reasoning: {qra.reasoning}
 Answer: {qra.answer}
 """
+    # The verdict is a pure function of (model, prompt, triplet); identical
+    # triplets across runs skip the LLM round-trip entirely
+    key = cache_key(
+        "qra_evaluator", "gpt-5-mini", _QRA_VERIFICATION_INSTRUCTIONS, input_text
+    )
+    cached = cache_get(key)
+    if cached is not None:
+        output = QRAVerificationOutput.model_validate_json(cached)
+        return output.is_valid, output.feedback
+
+    # MCP-free agent with a static prompt: one instance for the process
+    agent = cached_agent(
+        "qra_evaluator",
+        "gpt-5-mini",
+        lambda: AgentWrapper[QRAVerificationOutput].create(
+            name="qra_evaluator",
+            instructions=_QRA_VERIFICATION_INSTRUCTIONS,
+            model=get_aoai("gpt-5-mini"),
+            output_type=QRAVerificationOutput,
+        ),
+    )
 
     ret = await agent.run(input=input_text)
     output = ret.final_output()
+    cache_put(key, output.model_dump_json())
     return output.is_valid, output.feedback
+
+
+async def verify_qra_many(
+    qras: list[QRA], max_concurrency: int = 16
+) -> list[tuple[bool, str]]:
+    """Verifies a list of QRA triplets with bounded concurrency.
+
+    Per-item round-trips overlap up to max_concurrency, so N triplets cost
+    roughly N/K sequential latencies instead of N. The provider Batch API
+    would halve token cost on top of this, but it needs the raw OpenAI
+    client, which oai_utils does not expose; this is the in-tree path.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def verify_one(qra: QRA) -> tuple[bool, str]:
+        async with semaphore:
+            return await verify_qra(qra)
+
+    return list(await asyncio.gather(*(verify_one(qra) for qra in qras)))
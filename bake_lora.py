@@ -1,4 +1,5 @@
 from pathlib import Path
+import torch
 from peft import PeftModel
 from transformers import AutoModelForCausalLM, AutoTokenizer
 
@@ -6,10 +7,25 @@ type PathLike = str | Path
 
 
 def bake_lora(base_model_name: PathLike, lora_path: PathLike, output_path: PathLike):
-    base_model = AutoModelForCausalLM.from_pretrained(base_model_name)
-    lora_model: PeftModel = PeftModel.from_pretrained(base_model, lora_path)
+    # The adapters were trained in bf16 (see train_sft.py); loading the base
+    # in fp32 on CPU made merge_and_unload push ~16 GB of weights through
+    # CPU matmuls. bf16 on the GPU halves the bytes moved at every step
+    # (load, merge, save) and the W += B @ A adds run at GPU throughput.
+    base_model = AutoModelForCausalLM.from_pretrained(
+        base_model_name,
+        torch_dtype=torch.bfloat16,
+        device_map="auto",
+        low_cpu_mem_usage=True,
+    )
+    lora_model: PeftModel = PeftModel.from_pretrained(
+        base_model, lora_path, torch_dtype=torch.bfloat16
+    )
     merged_model = lora_model.merge_and_unload()  # type: ignore
-    merged_model.save_pretrained(output_path)
+    # Sharded safetensors: consumers mmap the shards lazily instead of
+    # deserializing one monolithic pickle to touch any tensor
+    merged_model.save_pretrained(
+        output_path, safe_serialization=True, max_shard_size="2GB"
+    )
     tokenizer = AutoTokenizer.from_pretrained(base_model_name)
     tokenizer.save_pretrained(output_path)
 
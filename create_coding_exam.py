@@ -1,15 +1,16 @@
 from openhands.sdk.event.llm_convertible.message import MessageEvent
 from adapter.utils.id import gen_id
 import asyncio
+import csv
 import os
 import platform
+import functools
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from itertools import chain
 from pathlib import Path
 from typing import Self
 
-import polars as pl
 from agents.extensions.models.litellm_model import LitellmModel
 from dotenv import load_dotenv
 from loguru import logger
@@ -21,13 +22,11 @@ from openhands.tools.terminal import TerminalTool
 from pydantic.main import BaseModel
 
 from adapter.exam.exam import CodingExam
-from adapter.exam.renv import RustCodingEnvironment
+from adapter.exam.renv import RustCodingEnvironment, RustEnvironmentPool
 from adapter.exam.repository import GitRepository
-from adapter.find_topic import find_topics
-from adapter.questioner.qra.finder import list_document_filepaths
 from adapter.topic.filtering import is_useful_for_users
-from adapter.topic.topics import TopicEntities, TopicEntity
-from async_utils import gather_with_semaphore
+from adapter.topic.pipeline import build_topic_entities
+from adapter.topic.topics import TopicEntity
 
 
 class ExamConfig(BaseModel):
@@ -50,7 +49,8 @@ class ExamConfig(BaseModel):
             image_name="ohserver-rust",
             project_dir=Path("../rust-benchmarks").absolute(),
             library_dir=Path("repositories/numrs").absolute(),
-            topic_extraction_semaphore=3,
+            # Network-bound stage; override per provider tier via LLM_CONCURRENCY
+            topic_extraction_semaphore=int(os.getenv("LLM_CONCURRENCY", "30")),
             exam_generation_semaphore=5,
             max_topics=30,
             batch_size=30,
@@ -59,14 +59,30 @@ class ExamConfig(BaseModel):
         )
 
 
+@functools.lru_cache(maxsize=1)
 def detect_platform() -> str:
-    """Detects the correct Docker platform string."""
+    """Detects the correct Docker platform string once; the host arch never changes."""
     machine = platform.machine().lower()
     if "arm" in machine or "aarch64" in machine:
         return "linux/arm64"
     return "linux/amd64"
 
 
+def _has_text_content(event: MessageEvent) -> bool:
+    """Structural check for a non-empty assistant message.
+
+    event.visualize re-renders the message (rich markup over the whole
+    content) on every event; inspecting the message parts directly avoids
+    paying that rendering cost hundreds of times per conversation.
+    """
+    message = getattr(event, "llm_message", None)
+    content = getattr(message, "content", None)
+    if content is None:
+        # Unknown event shape; fall back to the rendered form
+        return "[no text content]" not in str(event.visualize)
+    return any(getattr(part, "text", "").strip() for part in content)
+
+
 @dataclass
 class EmptyResponseDetector:
     counts: int = 0
@@ -77,9 +93,7 @@ class EmptyResponseDetector:
         self.conversation = conversation
 
     def __call__(self, event: Event) -> None:
-        if isinstance(event, MessageEvent) and "[no text content]" in str(
-            event.visualize
-        ):
+        if isinstance(event, MessageEvent) and not _has_text_content(event):
             if self.conversation is None:
                 raise ValueError("Conversation is not set")
             self.counts += 1
@@ -88,44 +102,20 @@ class EmptyResponseDetector:
                 raise ValueError("Looks like agent is stuck")
 
 
-def generate_exam(
-    project: GitRepository,
-    library: GitRepository,
-    agent: Agent,
-    image_name: str,
-    topic: TopicEntity,
-) -> CodingExam | None:
-    """Orchestrate the exam creation process using an AI agent."""
-    logger.info(
-        f"Starting exam generation for project: {project.name}, library: {library.name}, topic: {topic.topic.title}"
-    )
-    with RustCodingEnvironment(
-        branch_name=gen_id("repo"),
-        project=project,
-        library=library,
-        image=image_name,
-    ) as env:
-        # Use auto-mounting from RustCodingEnvironment
-        workspace = env.workspace
-
-        empty_response_detector = EmptyResponseDetector()
-
-        # Phase 1: Ask agent to create question, solution, and test
-        conversation = Conversation(
-            agent=agent, workspace=workspace, callbacks=[empty_response_detector]
-        )
-        empty_response_detector.set_conversation(conversation)
-        prompt = f"""\
+# Built once at import; per exam only the library/topic fields are
+# substituted. Keeping the skeleton constant also keeps the shared prefix
+# byte-identical across exams, which provider-side prompt caching keys on.
+_EXAM_PROMPT_TEMPLATE = """\
 <task>
-You are a rust coding exam generator for library `{library.name}`.
-You are inside a cargo project. We cloned `{library.name}` repository in the at repositories/{library.name}/.
-You should first read the `{library.name}` repository.
+You are a rust coding exam generator for library `{library_name}`.
+You are inside a cargo project. We cloned `{library_name}` repository in the at repositories/{library_name}/.
+You should first read the `{library_name}` repository.
 
-Target Topic: {topic.topic.title}
-Topic Description: {topic.topic.description}
-Reference File: {topic.file_path}
+Target Topic: {topic_title}
+Topic Description: {topic_description}
+Reference File: {file_path}
 
-Then 
+Then
 1. Create a question about usage of the library regarding the target topic.
 2. Create a solution in lib.rs file.
 3. Write down a test code for the solution.
@@ -136,64 +126,133 @@ Then
 - When installing the dependencies, do not use path dependency.
     - You should install it via cargo command. The library repository is just for your reference.
     - How to install the library is not part of the exam.
-- Do not refer to the documents/source code of `{library.name}` repository in your question.
-    - The `{library.name}` repository is not visible to solver. Solver is expected to remember the usage of the library.
+- Do not refer to the documents/source code of `{library_name}` repository in your question.
+    - The `{library_name}` repository is not visible to solver. Solver is expected to remember the usage of the library.
     - For example testing solver's understanding about specific functions is good, but asking solver to read the source code is not good.
 - The tests should be strict enough to fail when solver's solution is wrong.
 - Tests should be located in tests/ directory which will be hidden from solver.
 - Write down the question in README.md file.
 </Guidelines>
 """
-        conversation.send_message(prompt)
-        conversation.run()
-
-        # Verify solution
-        test_result = env.run_test()
-        if not test_result.is_success:
-            logger.error(f"Generated solution failed tests:\n{test_result.output}")
-            return None
-
-        # Commit and push solution
-        solution_commit_hash = env.push_exam(
-            message=f"feat: coding exam solution {env.branch_name}"
-        )
-        if not solution_commit_hash:
-            logger.error("Failed to push solution commit")
-            return None
 
-        # Phase 2: Ask agent to clean the solution
-        clean_prompt = """\
+_CLEAN_PROMPT = """\
 <task>
-Now, please clean the solution from lib.rs. 
+Now, please clean the solution from lib.rs.
 The goal is to leave the lib.rs in a state where the solver needs to implement the solution, but the tests you wrote in tests/ directory still exist and can be used to verify the solver's work.
 You should remove the implementation logic and also remove all imports. The solver is expected to know which modules and types they need to import.
 Only leave minimal signature so that agent can tackle the problem without seeing the test code.
 </task>
 """
-        conversation.send_message(clean_prompt)
-        conversation.run()
-
-        # Commit and push problem (without running tests, as it's now "broken" by design)
-        problem_commit_hash = env.push_exam(
-            message=f"feat: coding exam problem {env.branch_name}"
-        )
-        if not problem_commit_hash:
-            logger.error("Failed to push problem commit")
-            return None
 
-        # Read the generated question
-        readme_path = env.cloned_repo.local_dir / "README.md"
-        question = readme_path.read_text() if readme_path.exists() else ""
 
-        return CodingExam(
-            id=gen_id("exam"),
-            image_name=image_name,
+def generate_exam(
+    project: GitRepository,
+    library: GitRepository,
+    agent: Agent,
+    image_name: str,
+    topic: TopicEntity,
+    pool: RustEnvironmentPool | None = None,
+) -> CodingExam | None:
+    """Orchestrate the exam creation process using an AI agent."""
+    logger.info(
+        f"Starting exam generation for project: {project.name}, library: {library.name}, topic: {topic.topic.title}"
+    )
+    branch_name = gen_id("repo")
+    if pool is None:
+        with RustCodingEnvironment(
+            branch_name=branch_name,
             project=project,
             library=library,
-            solution_commit=solution_commit_hash,
-            problem_commit=problem_commit_hash,
-            question=question,
-        )
+            image=image_name,
+        ) as env:
+            return _generate_in_env(library, agent, image_name, topic, env)
+
+    # With a pool, the container (and its warmed cargo caches) survives
+    # across exams; only the working tree is reset between topics
+    env = pool.acquire(
+        branch_name=branch_name,
+        project=project,
+        library=library,
+        image=image_name,
+    )
+    try:
+        return _generate_in_env(library, agent, image_name, topic, env)
+    finally:
+        pool.release(env)
+
+
+def _generate_in_env(
+    library: GitRepository,
+    agent: Agent,
+    image_name: str,
+    topic: TopicEntity,
+    env: RustCodingEnvironment,
+) -> CodingExam | None:
+    # Use auto-mounting from RustCodingEnvironment
+    workspace = env.workspace
+
+    empty_response_detector = EmptyResponseDetector()
+
+    # Phase 1: Ask agent to create question, solution, and test
+    conversation = Conversation(
+        agent=agent, workspace=workspace, callbacks=[empty_response_detector]
+    )
+    empty_response_detector.set_conversation(conversation)
+    prompt = _EXAM_PROMPT_TEMPLATE.format(
+        library_name=library.name,
+        topic_title=topic.topic.title,
+        topic_description=topic.topic.description,
+        file_path=topic.file_path,
+    )
+    conversation.send_message(prompt)
+    conversation.run()
+
+    # Verify solution
+    test_result = env.run_test()
+    if not test_result.is_success:
+        logger.error(f"Generated solution failed tests:\n{test_result.output}")
+        return None
+
+    # Commit and push solution
+    solution_commit_hash = env.push_exam(
+        message=f"feat: coding exam solution {env.branch_name}"
+    )
+    if not solution_commit_hash:
+        logger.error("Failed to push solution commit")
+        return None
+
+    # Phase 2: Ask agent to clean the solution
+    clean_prompt = _CLEAN_PROMPT
+    conversation.send_message(clean_prompt)
+    conversation.run()
+
+    # Commit and push problem (without running tests, as it's now "broken" by design)
+    problem_commit_hash = env.push_exam(
+        message=f"feat: coding exam problem {env.branch_name}"
+    )
+    if not problem_commit_hash:
+        logger.error("Failed to push problem commit")
+        return None
+
+    # Read the generated question, capped so a runaway README cannot pull
+    # an unbounded blob into the exam row (64 KiB is far above any real
+    # question)
+    readme_path = env.cloned_repo.local_dir / "README.md"
+    try:
+        with readme_path.open("r") as f:
+            question = f.read(65536)
+    except FileNotFoundError:
+        question = ""
+
+    return CodingExam(
+        id=gen_id("exam"),
+        image_name=image_name,
+        project=project,
+        library=library,
+        solution_commit=solution_commit_hash,
+        problem_commit=problem_commit_hash,
+        question=question,
+    )
 
 
 async def async_main():
@@ -215,38 +274,12 @@ async def async_main():
         config.project_dir / "topics.json"
     )  # Adjust path as needed, using project dir for now or create data dir
 
-    if not topic_save_path.exists():
-        logger.info("Topic file not found, extracting topics from documents")
-        file_paths = await list_document_filepaths(config.library_dir, model=litellm)
-        logger.info(f"Found {len(file_paths.file_paths)} document files")
-        topics = await gather_with_semaphore(
-            [
-                find_topics(config.library_dir, file_path, model=litellm)
-                for file_path in file_paths.file_paths
-            ],
-            config.topic_extraction_semaphore,
-            progressbar=True,
-        )
-        file_topics = TopicEntities(
-            topics=list(
-                chain.from_iterable(
-                    [
-                        [
-                            TopicEntity(file_path=file_path, topic=topic)
-                            for topic in topics.topics
-                        ]
-                        for file_path, topics in zip(file_paths.file_paths, topics)
-                    ]
-                )
-            )
-        )
-        logger.info(
-            f"Extracted {len(file_topics.topics)} topics, saving to {topic_save_path}"
-        )
-        file_topics.save(topic_save_path)
-    else:
-        logger.info(f"Loading existing topics from {topic_save_path}")
-        file_topics = TopicEntities.load(topic_save_path)
+    file_topics = await build_topic_entities(
+        config.library_dir,
+        model=litellm,
+        max_concurrency=config.topic_extraction_semaphore,
+        save_path=topic_save_path,
+    )
 
     # 2. Exam Generation
     logger.info(f"Generating exams for {len(file_topics.topics)} topics")
@@ -259,91 +292,148 @@ async def async_main():
         name=config.library_dir.name, local_dir=config.library_dir
     )
 
-    exams_data = []
+    # Stream rows straight to the CSV instead of rewriting the whole history
+    # every batch_size exams; the file itself is the accumulator
+    fieldnames = [
+        "id",
+        "topic_title",
+        "topic_description",
+        "file_path",
+        "question",
+        "solution_commit",
+        "problem_commit",
+        "image_name",
+        "status",
+    ]
+    output = open(config.output_file, "w", newline="")
+    writer = csv.DictWriter(output, fieldnames=fieldnames)
+    writer.writeheader()
+    exam_count = 0
     exams_lock = asyncio.Lock()
-    semaphore = asyncio.Semaphore(config.exam_generation_semaphore)
+    # One bounded executor for every generate_exam call: the default
+    # to_thread executor grows to min(32, cpus + 4) threads, each of which
+    # would drive its own Docker container; this pins the OS thread count
+    # (and hence container parallelism) to exam_generation_semaphore and
+    # avoids per-call thread creation
+    executor = ThreadPoolExecutor(
+        max_workers=config.exam_generation_semaphore, thread_name_prefix="exam"
+    )
+    # Containers (and their warmed cargo caches) are reused across topics
+    # instead of being started and torn down per exam
+    env_pool = RustEnvironmentPool()
+
+    async def write_row(row: dict[str, str]) -> None:
+        nonlocal exam_count
+        async with exams_lock:
+            writer.writerow(row)
+            output.flush()
+            exam_count += 1
+            if exam_count % config.batch_size == 0:
+                logger.info(f"Progress: {exam_count} exams recorded")
 
     async def process_topic(topic: TopicEntity):
-        is_useful = await is_useful_for_users(topic.topic, model=litellm)
-        if not is_useful:
-            return
-        async with semaphore:
-            try:
-                # Create a fresh agent for each exam to avoid state pollution
-                agent_instance = Agent(
-                    llm=llm,
-                    tools=[
-                        Tool(name=TerminalTool.name),
-                        Tool(name=FileEditorTool.name),
-                        Tool(name=TaskTrackerTool.name),
-                    ],
-                )
+        try:
+            is_useful = await is_useful_for_users(topic.topic, model=litellm)
+            if not is_useful:
+                return
+
+            # Create a fresh agent for each exam to avoid state pollution
+            agent_instance = Agent(
+                llm=llm,
+                tools=[
+                    Tool(name=TerminalTool.name),
+                    Tool(name=FileEditorTool.name),
+                    Tool(name=TaskTrackerTool.name),
+                ],
+            )
 
-                # Run the sync generate_exam in a thread
-                exam = await asyncio.to_thread(
+            # Run the sync generate_exam on the bounded executor; its
+            # worker count is the concurrency cap, so no extra semaphore
+            exam = await asyncio.get_running_loop().run_in_executor(
+                executor,
+                functools.partial(
                     generate_exam,
                     project=example_project,
                     library=example_library,
                     agent=agent_instance,
                     image_name=config.image_name,
                     topic=topic,
+                    pool=env_pool,
+                ),
+            )
+
+            if exam is None:
+                logger.warning(
+                    f"Failed to generate exam for topic {topic.topic.title}"
                 )
+                return
+
+            await write_row(
+                {
+                    "id": exam.id,
+                    "topic_title": topic.topic.title,
+                    "topic_description": topic.topic.description,
+                    "file_path": topic.file_path,
+                    "question": exam.question,
+                    "solution_commit": exam.solution_commit,
+                    "problem_commit": exam.problem_commit,
+                    "image_name": config.image_name,
+                    "status": "generated",
+                }
+            )
 
-                if exam is None:
-                    logger.warning(
-                        f"Failed to generate exam for topic {topic.topic.title}"
-                    )
-                    return
-
-                async with exams_lock:
-                    exams_data.append(
-                        {
-                            "id": exam.id,
-                            "topic_title": topic.topic.title,
-                            "topic_description": topic.topic.description,
-                            "file_path": topic.file_path,
-                            "question": exam.question,
-                            "solution_commit": exam.solution_commit,
-                            "problem_commit": exam.problem_commit,
-                            "image_name": config.image_name,
-                            "status": "generated",
-                        }
-                    )
-
-                    # Periodic save
-                    if len(exams_data) % config.batch_size == 0:
-                        logger.info(
-                            f"Progress: {len(exams_data)} exams generated. Saving intermediate results..."
-                        )
-                        df = pl.DataFrame(exams_data)
-                        df.write_csv(config.output_file)
+        except Exception as e:
+            logger.error(f"Error processing topic {topic.topic.title}: {e}")
+            await write_row(
+                {
+                    "id": str(uuid.uuid4()),  # Placeholder ID
+                    "topic_title": topic.topic.title,
+                    "topic_description": topic.topic.description,
+                    "file_path": topic.file_path,
+                    "question": "",
+                    "solution_commit": "",
+                    "problem_commit": "",
+                    "image_name": config.image_name,
+                    "status": f"failed: {e}",
+                }
+            )
+
+    # Producer/consumer over a bounded queue: the first exams start while
+    # the producer is still feeding topics, and only a handful of pending
+    # items exist at any time instead of max_topics coroutines built up
+    # front, each closing over the shared writer and locks
+    queue: asyncio.Queue[TopicEntity] = asyncio.Queue(
+        maxsize=2 * config.exam_generation_semaphore
+    )
 
+    async def worker() -> None:
+        while True:
+            topic = await queue.get()
+            try:
+                await process_topic(topic)
             except Exception as e:
-                logger.error(f"Error processing topic {topic.topic.title}: {e}")
-                async with exams_lock:
-                    exams_data.append(
-                        {
-                            "id": str(uuid.uuid4()),  # Placeholder ID
-                            "topic_title": topic.topic.title,
-                            "topic_description": topic.topic.description,
-                            "file_path": topic.file_path,
-                            "question": "",
-                            "solution_commit": "",
-                            "problem_commit": "",
-                            "image_name": config.image_name,
-                            "status": f"failed: {e}",
-                        }
-                    )
-
-    tasks = [process_topic(topic) for topic in file_topics.topics[: config.max_topics]]
-    await gather_with_semaphore(
-        tasks, config.exam_generation_semaphore, progressbar=True
-    )  # Reusing gather for progress bar
-
-    # Final save
-    df = pl.DataFrame(exams_data)
-    df.write_csv(config.output_file)
-    logger.success(f"Saved {len(exams_data)} exams to {config.output_file}")
+                # process_topic records its own failures; this catch only
+                # exists so nothing can kill the worker — a dead worker
+                # strands its share of the queue and queue.join() never
+                # returns
+                logger.error(f"Worker error on topic {topic.topic.title}: {e}")
+            finally:
+                queue.task_done()
+
+    workers = [
+        asyncio.create_task(worker()) for _ in range(config.exam_generation_semaphore)
+    ]
+    for topic in file_topics.topics[: config.max_topics]:
+        await queue.put(topic)
+    await queue.join()
+    for task in workers:
+        task.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+
+    executor.shutdown(wait=True)
+    env_pool.close()
+    output.close()
+    logger.success(f"Saved {exam_count} exams to {config.output_file}")
 
 
 if __name__ == "__main__":
@@ -1,18 +1,18 @@
-from adapter.questioner.questioner import questioner
+from adapter.questioner.qra.questioner import questioner
 from adapter.models.problems import QRADataset, QRA
-from adapter.questioner.finder import list_document_filepaths
-from itertools import chain
 from pathlib import Path
 import asyncio
+import hashlib
+import os
 
 from dotenv.main import load_dotenv
 from loguru import logger
 from tqdm.asyncio import tqdm_asyncio
-from oai_utils.mcp.filesystem import filesystem_mcp
 
-from adapter.find_topic import find_topics
-from adapter.topic.topics import TopicEntities, TopicEntity
-from adapter.utils.async_util import gather_with_semaphore
+from adapter.mcp.pool import close_filesystem_mcps, get_filesystem_mcp
+from adapter.topic.pipeline import build_topic_entities
+from adapter.topic.topics import TopicEntity
+from adapter.utils.credit_semaphore import CreditSemaphore, estimate_credits
 from adapter.models.config import ProblemCreationConfig
 
 
@@ -20,7 +20,9 @@ async def main():
     load_dotenv()
     config = ProblemCreationConfig(
         repo_path=Path("./sqlglot"),
-        topic_extraction_semaphore=3,
+        # Topic extraction is network-bound; 3 concurrent calls sat far
+        # below provider limits. Override per-tier via LLM_CONCURRENCY.
+        topic_extraction_semaphore=int(os.getenv("LLM_CONCURRENCY", "30")),
         question_generation_semaphore=30,
         max_topics=1000,
         batch_size=30,
@@ -31,85 +33,105 @@ async def main():
     logger.info(f"Starting problem creation for repository: {config.repo_name}")
     logger.debug(f"Topic save path: {config.topic_save_path}")
 
-    if not config.topic_save_path.exists():
-        logger.info("Topic file not found, extracting topics from documents")
-        file_paths = await list_document_filepaths(config.repo_path)
-        logger.info(f"Found {len(file_paths.file_paths)} document files")
-        topics = await gather_with_semaphore(
-            [
-                find_topics(config.repo_path, file_path)
-                for file_path in file_paths.file_paths
-            ],
-            config.topic_extraction_semaphore,
-            progressbar=True,
-        )
-        file_topics = TopicEntities(
-            topics=list(
-                chain.from_iterable(
-                    [
-                        [
-                            TopicEntity(file_path=file_path, topic=topic)
-                            for topic in topics.topics
-                        ]
-                        for file_path, topics in zip(file_paths.file_paths, topics)
-                    ]
-                )
-            )
-        )
-        logger.info(
-            f"Extracted {len(file_topics.topics)} topics, saving to {config.topic_save_path}"
-        )
-        file_topics.save(config.topic_save_path)
-    else:
-        logger.info(f"Loading existing topics from {config.topic_save_path}")
-        file_topics = TopicEntities.load(config.topic_save_path)
+    file_topics = await build_topic_entities(
+        config.repo_path,
+        max_concurrency=config.topic_extraction_semaphore,
+        save_path=config.topic_save_path,
+    )
 
     logger.info(f"Generating problems for {len(file_topics.topics)} topics")
     problems: list[QRA] = []
     completed_count = 0
     save_lock = asyncio.Lock()
 
-    async with filesystem_mcp(
-        allowed_directories=[str(config.repo_path)], read_only=True
-    ) as filesystem:
-        semaphore = asyncio.Semaphore(config.question_generation_semaphore)
+    # One result shard per topic: a crashed or re-run invocation reuses
+    # every finished topic from disk instead of paying its LLM calls again
+    # (topic discovery itself resumes for free via the LLM disk cache)
+    questions_dir = config.repo_output_dir / "questions"
+    questions_dir.mkdir(exist_ok=True)
+
+    def result_shard(file_topic: TopicEntity) -> Path:
+        digest = hashlib.sha256(
+            f"{file_topic.file_path}\x00{file_topic.topic.title}\x00{file_topic.topic.description}".encode()
+        ).hexdigest()
+        return questions_dir / f"{digest}.json"
 
-        async def process_topic(file_topic: TopicEntity):
-            nonlocal completed_count
-            async with semaphore:
-                try:
-                    result = await questioner(
-                        config.repo_path,
-                        file_topic.file_path,
-                        file_topic.topic,
-                        filesystem_mcp=filesystem,
-                        model=config.model,
+    # One long-lived MCP session (with read cache and tool-call gating) is
+    # shared by every topic instead of paying a subprocess spawn per call
+    filesystem = await get_filesystem_mcp([config.repo_path])
+    # The count semaphore stays as an outer safety cap; actual throughput is
+    # paced by the credit gate against the provider's token-per-minute
+    # budget, so small topics no longer leave most of the budget idle
+    semaphore = asyncio.Semaphore(config.question_generation_semaphore)
+    credit_gate = CreditSemaphore(total_credits=config.tpm_budget)
+
+    async def process_topic(file_topic: TopicEntity):
+        nonlocal completed_count
+        async with semaphore:
+            try:
+                shard = result_shard(file_topic)
+                if shard.exists():
+                    result = QRADataset.load(shard).problems
+                else:
+                    result = await credit_gate.transact(
+                        questioner(
+                            config.repo_path,
+                            file_topic.file_path,
+                            file_topic.topic,
+                            filesystem_mcp=filesystem,
+                            model=config.model,
+                        ),
+                        credits=estimate_credits(
+                            file_topic.file_path,
+                            file_topic.topic.title,
+                            file_topic.topic.description,
+                        ),
                     )
                     if result:
-                        async with save_lock:
-                            problems.extend(result)
-                except Exception as e:
-                    logger.error(
-                        f"Error processing topic {file_topic.topic.title}: {e}"
-                    )
-                finally:
+                        QRADataset.model_construct(problems=result).save(shard)
+                if result:
                     async with save_lock:
-                        completed_count += 1
-                        if completed_count % 30 == 0:
-                            logger.info(
-                                f"Progress: {completed_count}/{config.max_topics}. Saving intermediate results..."
-                            )
-                            dataset = QRADataset(problems=problems)
-                            dataset.save(config.output_path)
+                        problems.extend(result)
+            except Exception as e:
+                logger.error(
+                    f"Error processing topic {file_topic.topic.title}: {e}"
+                )
+            finally:
+                # Snapshot under the lock, serialize outside it: holding the
+                # lock for an O(N) dataset dump would stall every other
+                # completion for the duration of the write
+                snapshot: list[QRA] | None = None
+                async with save_lock:
+                    completed_count += 1
+                    if completed_count % 30 == 0:
+                        logger.info(
+                            f"Progress: {completed_count}/{config.max_topics}. Saving intermediate results..."
+                        )
+                        snapshot = list(problems)
+                if snapshot is not None:
+                    # problems is already a list[QRA]; skip re-validation,
+                    # and keep the dump off the event loop
+                    dataset = QRADataset.model_construct(problems=snapshot)
+                    await asyncio.to_thread(dataset.save, config.output_path)
 
-        tasks = [
-            process_topic(file_topic)
-            for file_topic in file_topics.topics[: config.max_topics]
-        ]
-        await tqdm_asyncio.gather(*tasks)
+    try:
+        # TaskGroup owns the tasks, so a crash in the driver loop cancels
+        # them instead of leaving orphan coroutines (process_topic handles
+        # its own errors, so siblings are never torn down mid-run); the
+        # as_completed loop ticks the progress bar as tasks retire rather
+        # than only once everything is gathered
+        async with asyncio.TaskGroup() as tg:
+            futures = [
+                tg.create_task(process_topic(file_topic))
+                for file_topic in file_topics.topics[: config.max_topics]
+            ]
+            for future in tqdm_asyncio.as_completed(futures, total=len(futures)):
+                await future
+    finally:
+        await close_filesystem_mcps()
 
     # Final save
-    dataset = QRADataset(problems=problems)
+    dataset = QRADataset.model_construct(problems=problems)
     dataset.save(config.output_path)
     logger.success(f"Saved {len(problems)} problems to {config.output_path}")
 
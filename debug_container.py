@@ -1,13 +1,13 @@
-from adapter.exam.exam import load_exam_from_csv
-import time
+from adapter.exam.exam import list_exam_ids, load_exam_from_csv
+import random
 import signal
 import sys
+import threading
 import argparse
 from pathlib import Path
 from dotenv import load_dotenv
 from adapter.exam.renv import RustCodingEnvironment
 from loguru import logger
-import polars as pl
 
 # Import from the sibling script
 from create_coding_exam import (
@@ -78,9 +78,12 @@ def launch_debug_container(
 
             logger.info("Press Ctrl+C to stop the container and cleanup.")
 
-            # Keep alive loop
-            while True:
-                time.sleep(1)
+            # Block until a signal arrives instead of waking once a second;
+            # Ctrl+C still lands in handle_interrupt / KeyboardInterrupt
+            if hasattr(signal, "pause"):
+                signal.pause()
+            else:  # Windows: no signal.pause; an unset Event blocks the same way
+                threading.Event().wait()
 
     except KeyboardInterrupt:
         logger.info("\nKeyboardInterrupt caught. Cleaning up...")
@@ -124,13 +127,19 @@ def main():
             f"No exam ID provided. Sampling a random exam from {config.output_file}..."
         )
         try:
-            df = pl.read_csv(config.output_file)
-            df = df.filter(pl.col("status") == "generated")
-            if not df.is_empty():
-                random_exam_row = df.sample(1)
-                random_id = random_exam_row["id"][0]
+            # Reuses the same cached row index (and Parquet sidecar) as
+            # load_exam_from_csv, so the file is parsed at most once per run
+            exam_ids = list_exam_ids(config.output_file, status="generated")
+            if exam_ids:
+                random_id = random.choice(exam_ids)
                 logger.info(f"Randomly selected exam ID: {random_id}")
-                exam = load_exam_from_csv(config.output_file, random_id, config)
+                exam = load_exam_from_csv(
+                    config.output_file,
+                    random_id,
+                    image_name=config.image_name,
+                    project_dir=config.project_dir,
+                    library_dir=config.library_dir,
+                )
             else:
                 logger.warning(
                     "Exam file is empty or not found. Proceeding with default environment."
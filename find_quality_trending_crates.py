@@ -9,109 +9,93 @@ def main():
     dependencies_path = f"{base_dir}/dependencies.csv"
     versions_path = f"{base_dir}/versions.csv"
 
-    print("Loading dataframes...")
-    df_crates = pl.read_csv(crates_path, ignore_errors=True)
-    df_downloads = pl.read_csv(downloads_path)
-    df_deps = pl.read_csv(dependencies_path, ignore_errors=True)
-    df_versions = pl.read_csv(versions_path, ignore_errors=True)
-
-    # Date parsing
-    def parse_date(x):
-        try:
-            return datetime.fromisoformat(x)
-        except (ValueError, TypeError, AttributeError):
-            try:
-                if isinstance(x, str):
-                    return datetime.fromisoformat(x.replace("Z", "+00:00"))
-            except Exception:
-                return None
-            return None
-
-    print("Parsing dates...")
-    df_crates = df_crates.with_columns(
+    print("Building lazy pipeline...")
+    # scan_csv keeps every source lazy: the whole query below is one plan
+    # with a single collect at the end, so Polars can fuse the filters and
+    # joins, share the crates scan between its three uses, and stream
+    # instead of materializing four CSVs plus every intermediate result
+    lf_crates = pl.scan_csv(crates_path, ignore_errors=True)
+    lf_downloads = pl.scan_csv(downloads_path)
+    lf_deps = pl.scan_csv(dependencies_path, ignore_errors=True)
+    lf_versions = pl.scan_csv(versions_path, ignore_errors=True)
+
+    # Native datetime parsing runs vectorized in Rust instead of calling a
+    # Python function per crate row; strict=False nulls unparseable values,
+    # matching the old try/except-to-None fallback
+    lf_crates = lf_crates.with_columns(
         pl.col("created_at")
-        .map_elements(parse_date, return_dtype=pl.Datetime("us", "UTC"))
+        .str.replace("Z$", "+00:00")
+        .str.to_datetime(time_unit="us", time_zone="UTC", strict=False)
         .alias("created_at")
     )
 
     # 1. Repository Age Filter
-    print("Filtering old repositories...")
     repo_start_dates = (
-        df_crates.lazy()
-        .filter(pl.col("repository").is_not_null())
+        lf_crates.filter(pl.col("repository").is_not_null())
         .group_by("repository")
         .agg(pl.min("created_at").alias("repo_start_date"))
-        .collect()
     )
     old_repo_cutoff = datetime(2024, 7, 1, tzinfo=timezone.utc)
     new_repos = repo_start_dates.filter(pl.col("repo_start_date") >= old_repo_cutoff)
 
     # Filter crates to only those in new repos
-    df_crates_new_repos = df_crates.join(new_repos, on="repository", how="inner")
+    lf_crates_new_repos = lf_crates.join(new_repos, on="repository", how="inner")
 
     # 2. Dependency Analysis
-    print("Analyzing dependencies...")
     # Map version_id -> crate_id
-    version_to_crate = df_versions.select(["id", "crate_id"]).rename(
+    version_to_crate = lf_versions.select(["id", "crate_id"]).rename(
         {"id": "version_id", "crate_id": "dependant_id"}
     )
 
     # Enrich dependencies with dependant_id
-    df_deps_enriched = df_deps.lazy().join(
-        version_to_crate.lazy(), on="version_id", how="inner"
-    )
+    lf_deps_enriched = lf_deps.join(version_to_crate, on="version_id", how="inner")
 
-    # Calculate direct dependant count (unique crates depending on this crate)
+    # Calculate direct dependant count (unique crates depending on this crate).
+    # Deduplicating the pair globally first replaces the per-group hashset
+    # that n_unique-inside-agg would build with one flat two-column hash
+    # table, after which the group_by is a plain row count
     direct_dependants = (
-        df_deps_enriched.group_by("crate_id")
-        .agg(pl.col("dependant_id").n_unique().alias("direct_dependant_count"))
-        .collect()
+        lf_deps_enriched.select(["crate_id", "dependant_id"])
+        .unique()
+        .group_by("crate_id")
+        .agg(pl.len().alias("direct_dependant_count"))
     )
 
     # Identify "Frontend" crates:
-    # 1. Join dependencies with repos for both sides
-    repo_mapping = df_crates.select(["id", "repository"]).rename(
-        {"id": "crate_id", "repository": "repo"}
+    # 1. Join dependencies with repos for both sides. Aliasing inside the
+    # select keeps the projection in one node, and renaming the mapping for
+    # the dependant side up front drops the post-join rename hops (the
+    # first join's repo column is already unambiguous)
+    repo_mapping = lf_crates.select(
+        pl.col("id").alias("crate_id"), pl.col("repository").alias("repo")
     )
 
     internal_deps = (
-        df_deps_enriched.join(
-            repo_mapping.lazy(), on="crate_id", how="inner"
-        )  # target crate repo
-        .rename({"repo": "target_repo"})
+        lf_deps_enriched.join(repo_mapping, on="crate_id", how="inner")  # target repo
         .join(
-            repo_mapping.lazy(),
-            left_on="dependant_id",
-            right_on="crate_id",
+            repo_mapping.rename({"crate_id": "dependant_id", "repo": "dependant_repo"}),
+            on="dependant_id",
             how="inner",
         )  # dependant crate repo
-        .rename({"repo": "dependant_repo"})
-        .filter(pl.col("target_repo") == pl.col("dependant_repo"))
-        .select(["crate_id"])
+        .filter(pl.col("repo") == pl.col("dependant_repo"))
+        .select("crate_id")
         .unique()
-        .collect()
     )
 
-    # Crates that ARE dependencies within their own repo
-    internal_dep_ids = internal_deps["crate_id"].to_list()
-
     # 3. Quality Filters & Frontend filtering
-    print("Applying quality and frontend filters...")
-    df_quality = df_crates_new_repos.filter(
+    # The anti-join keeps "frontend" crates (those never depended on within
+    # their own repo) without round-tripping the id column through a Python
+    # list for is_in; Polars runs it as a hash anti-join
+    df_quality = lf_crates_new_repos.filter(
         pl.col("description").str.len_chars() > 10,
         (pl.col("documentation").is_not_null()) & (pl.col("homepage").is_not_null()),
         pl.col("readme").str.len_chars() > 100,
-        ~pl.col("id").is_in(
-            internal_dep_ids
-        ),  # Filter out internal dependencies -> Keep "Frontends"
-    )
+    ).join(internal_deps, left_on="id", right_on="crate_id", how="anti")
 
     # 4. Join with Downloads and Dependant counts
-    print("Joining metrics...")
     q_joined = (
-        df_quality.lazy()
-        .join(df_downloads.lazy(), left_on="id", right_on="crate_id", how="left")
-        .join(direct_dependants.lazy(), left_on="id", right_on="crate_id", how="left")
+        df_quality.join(lf_downloads, left_on="id", right_on="crate_id", how="left")
+        .join(direct_dependants, left_on="id", right_on="crate_id", how="left")
         .fill_null(0)
     )
 
@@ -136,7 +120,7 @@ def main():
 
     print("--- Top 20 Quality Frontend New Crates (Sorted by Direct Dependants) ---")
     with pl.Config(fmt_str_lengths=100, tbl_rows=25):
-        print(q_final.collect())
+        print(q_final.collect(engine="streaming"))
 
 
 if __name__ == "__main__":
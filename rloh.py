@@ -1,4 +1,6 @@
 import asyncio
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, cast
 
@@ -81,14 +83,60 @@ RL_TRAINING_CONFIG: dict[str, Any] = {
 }
 
 
+class _ExamDataset(Sequence[CodingExamDict]):
+    """Materializes exam payload dicts lazily for the trainer.
+
+    Dumping every exam to a nested JSON dict up front keeps N payloads in
+    host RAM for the whole run, next to a 30B model. The validated models
+    (which share one project/library instance, courtesy of load_exams) are
+    held instead and each payload is built only when the trainer indexes it.
+    """
+
+    def __init__(self, exams: list[CodingExam]) -> None:
+        self._exams = exams
+
+    def __len__(self) -> int:
+        return len(self._exams)
+
+    def __getitem__(self, index: int) -> CodingExamDict:
+        return cast(CodingExamDict, self._exams[index].model_dump(mode="json"))
+
+
+# GRPO replays each exam n times per step and across epochs, always with an
+# identical payload per exam id; validating the nested model once per id
+# keeps pydantic off the per-rollout path
+_exam_cache: dict[str, CodingExam] = {}
+
+
+def _exam_from_task(task: CodingExamDict) -> CodingExam:
+    exam = _exam_cache.get(task["id"])
+    if exam is None:
+        exam = CodingExam.model_validate(task)
+        _exam_cache[task["id"]] = exam
+    return exam
+
+
 class LitOHAgent(agl.LitAgent):
+    def __init__(self) -> None:
+        super().__init__()
+        # solve_exam spends its time in LLM round-trips and docker/git
+        # subprocess waits — all GIL-releasing I/O — so threads are the
+        # right pool type, and a dedicated executor keeps rollout
+        # concurrency independent of the default to_thread pool (capped at
+        # min(32, cpus + 4)). A process pool would not fit here: the solver
+        # carries a live HTTP client and the environment pool is
+        # per-process state, neither of which pickles.
+        self._executor = ThreadPoolExecutor(
+            max_workers=64, thread_name_prefix="rollout"
+        )
+
     async def rollout_async(
         self,
         task: CodingExamDict,
         resources: agl.NamedResources,
         rollout: agl.Rollout,
     ) -> float | None:
-        exam = CodingExam.model_validate(task)
+        exam = _exam_from_task(task)
         agl_llm: agl.LLM = cast(agl.LLM, resources["main_llm"])
         base_url = agl_llm.get_base_url(
             rollout.rollout_id, cast(AttemptedRollout, rollout).attempt.attempt_id
@@ -103,7 +151,9 @@ class LitOHAgent(agl.LitAgent):
             base_url=base_url,
             api_key=agl_llm.api_key,
         )
-        value = await asyncio.to_thread(solver.solve_exam, exam)
+        value = await asyncio.get_running_loop().run_in_executor(
+            self._executor, solver.solve_exam, exam
+        )
         return float(value)
 
 
@@ -116,15 +166,14 @@ def train(config: dict[str, Any]) -> None:
     algorithm = agl.VERL(config)
     trainer = agl.Trainer(n_runners=1, algorithm=algorithm)
     print("Adapter agent match acknowledged:", trainer.adapter.agent_match)  # type: ignore
-    exams = [
-        exam.model_dump(mode="json")
-        for exam in load_exams(
+    exams = _ExamDataset(
+        load_exams(
             csv_path=csv_path,
             image_name=exam_config.image_name,
             project_dir=exam_config.project_dir,
             library_dir=exam_config.library_dir,
         )
-    ]
+    )
     trainer.fit(agent, train_dataset=exams, val_dataset=exams)
 
 
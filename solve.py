@@ -3,12 +3,12 @@ from oai_utils.tracing import setup_openai_tracing
 import asyncio
 from pathlib import Path
 from oai_utils.vllm import VLLMSetup
-from oai_utils.agent import AgentWrapper
+from oai_utils.agent import AgentWrapper, AgentsSDKModel
 from oai_utils.runresult import SimpleReasoningItem
 from adapter.models.problems import QRADataset, QAProblem, QRA
-from adapter.questioner.qra.evaluater import evaluate_qa
+from adapter.questioner.qra.evaluater import evaluate_qa_batch
 from adapter.utils.savable import Savable
-from async_utils import gather_with_semaphore
+from tqdm.asyncio import tqdm_asyncio
 
 
 class SolveResult(Savable):
@@ -22,10 +22,19 @@ class EvaluationResults(Savable):
     results: list[SolveResult]
 
 
-async def solve_and_evaluate(agent: AgentWrapper[str], qra: QRA) -> SolveResult | None:
+# Q/A pairs judged per judge call; one request grades the whole group
+JUDGE_BATCH_SIZE = 8
+
+
+async def solve(
+    agent: AgentWrapper[str], qra: QRA, vllm_slots: asyncio.Semaphore
+) -> tuple[QRA, str, str] | None:
+    """Run the solver agent and return (qra, reasoning, answer)."""
     try:
-        # Run agent to get answer
-        result = await agent.run(input=qra.question)
+        # Only the agent run holds a vLLM slot; judging happens later, in
+        # batches, under its own smaller cap
+        async with vllm_slots:
+            result = await agent.run(input=qra.question)
         agent_answer = result.final_output()
         simplified_items = result.output_with_reasoning().simplified()
 
@@ -38,22 +47,35 @@ async def solve_and_evaluate(agent: AgentWrapper[str], qra: QRA) -> SolveResult
         agent_reasoning = (
             reasoning_items[0] if reasoning_items else ""
         )  # User mentioned "at most 1"
+        return qra, agent_reasoning, agent_answer
+    except Exception as e:
+        # User requested to ignore tracing errors, but we still catch general errors
+        # If it's a tracing error, it might still bubble up or look like noise
+        print(f"Error solving problem: {e}")
+        return None
 
-        # Evaluate answer
-        qa_problem = QAProblem(question=qra.question, answer=qra.answer)
-        eval_result = await evaluate_qa(qa_problem, agent_answer, model="gpt-4o")
 
-        return SolveResult(
+async def judge_batch(
+    solved: list[tuple[QRA, str, str]],
+    judge_slots: asyncio.Semaphore,
+    judge_model: AgentsSDKModel,
+) -> list[SolveResult]:
+    """Grade a group of solved problems with one batched judge call."""
+    qa_problems = [
+        QAProblem(question=qra.question, answer=qra.answer) for qra, _, _ in solved
+    ]
+    answers = [answer for _, _, answer in solved]
+    async with judge_slots:
+        eval_results = await evaluate_qa_batch(qa_problems, answers, model=judge_model)
+    return [
+        SolveResult(
             qra=qra,
-            agent_reasoning=agent_reasoning,
-            agent_answer=agent_answer,
+            agent_reasoning=reasoning,
+            agent_answer=answer,
             is_correct=eval_result.is_correct,
         )
-    except Exception as e:
-        # User requested to ignore tracing errors, but we still catch general errors
-        # If it's a tracing error, it might still bubble up or look like noise
-        print(f"Error solving and evaluating problem: {e}")
-        return None
+        for (qra, reasoning, answer), eval_result in zip(solved, eval_results)
+    ]
 
 
 async def main():
@@ -62,6 +84,10 @@ async def main():
     # model_type = "Qwen-Finetuned"
     # model_type = "Qwen-Finetuned-Conv"
     data_parallel_size = 2
+    # vLLM's continuous-batching window per replica; the server keeps this
+    # many sequences in flight, so anything below data_parallel_size *
+    # max_num_seqs client-side leaves batch slots empty
+    max_num_seqs = 128
     model_type = "Qwen-Finetuned-Conv-bugfixed"
 
     setup_openai_tracing()
@@ -102,7 +128,8 @@ async def main():
         print(f"Dataset not found at {dataset_path}")
         return
 
-    qra_dataset = QRADataset.load(dataset_path).sort().head(12)
+    # top_k is sort().head() via a bounded heap: one pass, no full sort
+    qra_dataset = QRADataset.load(dataset_path).top_k(12)
     print(f"Loaded {len(qra_dataset.problems)} problems from {dataset_path}")
 
     # Create agent for solving
@@ -115,13 +142,30 @@ async def main():
     # Evaluate all problems in parallel
     print(f"Starting parallel evaluation of {len(qra_dataset.problems)} problems...")
 
-    tasks = [solve_and_evaluate(agent, qra) for qra in qra_dataset.problems]
-    # Increase concurrency since we have data_parallel_size = 4
-    results: list[SolveResult | None] = await gather_with_semaphore(
-        tasks, max_concurrent=32, progressbar=True
+    # Enough in-flight requests to saturate every replica's batch; the
+    # semaphore is only held during agent.run, so evaluations overlap with
+    # later generations instead of serializing behind the cap
+    vllm_slots = asyncio.Semaphore(data_parallel_size * max_num_seqs)
+    judge_slots = asyncio.Semaphore(32)
+    tasks = [solve(agent, qra, vllm_slots) for qra in qra_dataset.problems]
+    solved_raw = await tqdm_asyncio.gather(*tasks)
+    solved = [item for item in solved_raw if item is not None]
+
+    # Judge on the already-running local vLLM when there is one: grading is
+    # a simple comparative check well within Qwen3's reach, and it skips
+    # the public-API round trip and rate limits an external judge would
+    # add. One judge call grades JUDGE_BATCH_SIZE answers instead of one
+    # each — 12 problems become 2 round trips, with the judging
+    # instructions sent once per group rather than once per answer
+    judge_model: AgentsSDKModel = model
+    print(f"Judging {len(solved)} answers in batches of {JUDGE_BATCH_SIZE}...")
+    judged = await asyncio.gather(
+        *[
+            judge_batch(solved[i : i + JUDGE_BATCH_SIZE], judge_slots, judge_model)
+            for i in range(0, len(solved), JUDGE_BATCH_SIZE)
+        ]
     )
-
-    valid_results = [res for res in results if res is not None]
+    valid_results = [result for batch in judged for result in batch]
     correct_count = sum(1 for res in valid_results if res.is_correct)
     total_count = len(valid_results)
     accuracy = (correct_count / total_count) * 100 if total_count > 0 else 0
@@ -3,7 +3,6 @@ from adapter.exam.exam import load_exam_from_csv
 from oai_utils.vllm import VLLMSetup
 from adapter.utils.id import gen_id
 from create_coding_exam import EmptyResponseDetector
-import subprocess
 from pathlib import Path
 
 from loguru import logger
@@ -73,21 +72,18 @@ You should:
         conversation.send_message(prompt)
         conversation.run()
 
-        # Final verification with cargo test
+        # Final verification with cargo test; run_test streams the output
+        # into a bounded tail and bails on the first compile error instead
+        # of buffering the whole build log
         logger.info("Running final verification with cargo test")
-        try:
-            subprocess.run(
-                ["cargo", "test"],
-                cwd=env.cloned_repo.local_dir,
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+        test_result = env.run_test()
+        if test_result.is_success:
             logger.success(f"Exam {exam.id} solved successfully!")
             return True
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Final verification failed: {e.stderr or e.stdout}")
-            return False
+        logger.error(
+            f"Final verification failed: {test_result.stderr or test_result.stdout}"
+        )
+        return False
 
 
 def main():
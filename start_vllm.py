@@ -1,4 +1,4 @@
-import time
+import asyncio
 
 from oai_utils.vllm import VLLMSetup
 
@@ -12,8 +12,9 @@ async def main():
     #     data_parallel_size=data_parallel_size,
     # )
     await vllm_setup.ensure_vllm_running()
-    while True:
-        time.sleep(100)
+    # time.sleep would block the event loop (and any background tasks the
+    # vllm setup keeps running); an event that is never set idles instead
+    await asyncio.Event().wait()
 
 
 if __name__ == "__main__":
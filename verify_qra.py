@@ -1,34 +1,67 @@
-from adapter.verifier.verify import verify_qra
-from adapter.utils.async_util import gather_with_semaphore
+import asyncio
+import os
+import sys
 from pathlib import Path
-from adapter.models.problems import QRADataset
+
+from adapter.models.problems import QRA, QRADataset
+from adapter.verifier.verify import verify_qra
 
 
 async def main():
-    problems = Path("./sqlglot_problems.json")
-    if not problems.exists():
-        print(f"File {problems} not found.")
+    path = Path("./sqlglot_problems.json")
+    if not path.exists():
+        print(f"File {path} not found.")
         return
 
-    problems = QRADataset.load(problems)
+    problems = QRADataset.load(path)
     print(f"Found {len(problems.problems)} problems. Starting verification...")
 
-    verifications = await gather_with_semaphore(
-        [verify_qra(problem) for problem in problems.problems], 10
-    )
+    # Network-bound stage; override per provider tier via LLM_CONCURRENCY
+    concurrency = int(os.getenv("LLM_CONCURRENCY", "32"))
+
+    # One buffered write per verdict instead of six print calls, each of
+    # which takes the stdout lock (and, when line-buffered, flushes);
+    # the buffer is drained every 64 problems and once at the end
+    emitted = 0
 
-    for problem, (is_valid, feedback) in zip(problems.problems, verifications):
+    def emit(problem: QRA, is_valid: bool, feedback: str) -> None:
+        nonlocal emitted
         status = "✅ [VALID]" if is_valid else "❌ [INVALID]"
-        print("-" * 80)
-        print(f"Question: {problem.question}")
-        print(f"Reasoning: {problem.reasoning}")
-        print(f"Answer: {problem.answer}")
-        print(f"Status: {status}")
-        print(f"Feedback: {feedback}")
+        sys.stdout.write(
+            "\n".join(
+                (
+                    "-" * 80,
+                    f"Question: {problem.question}",
+                    f"Reasoning: {problem.reasoning}",
+                    f"Answer: {problem.answer}",
+                    f"Status: {status}",
+                    f"Feedback: {feedback}",
+                )
+            )
+            + "\n"
+        )
+        emitted += 1
+        if emitted % 64 == 0:
+            sys.stdout.flush()
+
+    # A fixed set of workers pulls from one shared iterator, so only
+    # ~concurrency verify coroutines exist at a time instead of one per
+    # problem; verdicts are emitted as they land and the TaskGroup tears
+    # everything down cleanly if one fails
+    problems_iter = iter(problems.problems)
+
+    async def worker() -> None:
+        for problem in problems_iter:
+            is_valid, feedback = await verify_qra(problem)
+            emit(problem, is_valid, feedback)
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(concurrency):
+            tg.create_task(worker())
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
-    import asyncio
     from dotenv import load_dotenv
 
     load_dotenv()